@@ -0,0 +1,177 @@
+"""
+Bulk JSON-lines dispatcher for AdvancedMathCalculator.
+
+Each input line is a request such as
+    {"id": 7, "op": "solve_quadratic", "args": [1, -3, 2]}
+and produces one output line, in input order:
+    {"id": 7, "result": {...}}   or   {"id": 7, "error": "..."}
+
+Usage:
+    python calculator_batch.py requests.jsonl -o results.jsonl --workers 8
+    cat requests.jsonl | python calculator_batch.py > results.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from calculator_engine import AdvancedMathCalculator, np
+
+# One engine per worker process, created lazily
+_calculator = None
+
+
+def _to_jsonable(value):
+    """Convert engine results (complex numbers, arrays, result objects) to JSON types."""
+    if isinstance(value, complex):
+        return {'real': value.real, 'imag': value.imag}
+    if isinstance(value, dict):
+        return {str(k): _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, array):
+        return value.tolist()
+    if np is not None and isinstance(value, (np.ndarray, np.generic)):
+        return _to_jsonable(value.tolist())
+    if hasattr(value, 'to_rows'):
+        return value.to_rows()
+    if hasattr(value, 'to_dict'):
+        return _to_jsonable(value.to_dict())
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, (set, frozenset)):
+        return [_to_jsonable(v) for v in value]
+    if hasattr(value, '__dict__') and not callable(value):
+        # Plain result objects (e.g. LUFactorization): their public attributes
+        return {k: _to_jsonable(v) for k, v in vars(value).items() if not k.startswith('_')}
+    return str(value)
+
+
+def execute_request(calculator: AdvancedMathCalculator, request: Dict) -> Dict:
+    """Run one request against calculator and build its response record."""
+    response = {'id': request.get('id')} if 'id' in request else {}
+    op = request.get('op')
+    if not isinstance(op, str) or op.startswith('_') or not callable(getattr(calculator, op, None)):
+        response['error'] = f"Unknown operation: {op}"
+        return response
+
+    calculator.error_message = ""
+    try:
+        result = getattr(calculator, op)(*request.get('args', []), **request.get('kwargs', {}))
+    except Exception as e:
+        response['error'] = str(e)
+        return response
+
+    if result is None and calculator.error_message:
+        response['error'] = calculator.error_message
+    else:
+        response['result'] = _to_jsonable(result)
+    return response
+
+
+def process_chunk(lines: List[str]) -> List[str]:
+    """Worker entry point: turn a chunk of request lines into response lines."""
+    global _calculator
+    if _calculator is None:
+        _calculator = AdvancedMathCalculator()
+
+    output = []
+    for line in lines:
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+        except ValueError as e:
+            output.append(json.dumps({'error': f"Invalid request: {e}"}))
+            continue
+        response = execute_request(_calculator, request)
+        try:
+            output.append(json.dumps(response))
+        except (TypeError, ValueError) as e:
+            # e.g. an int beyond the int-to-str digit limit
+            response.pop('result', None)
+            response['error'] = f"Result cannot be serialized: {e}"
+            output.append(json.dumps(response))
+    return output
+
+
+def _read_chunks(stream, chunk_size: int):
+    chunk = []
+    for line in stream:
+        if line.strip():
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(input_stream, output_stream, workers: int = None,
+        chunk_size: int = 256, max_in_flight: int = None) -> int:
+    """
+    Stream requests from input_stream to output_stream and return the line count.
+    At most max_in_flight chunks are queued at once, which bounds memory use.
+    workers=1 processes everything in this process without a pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    count = 0
+
+    if workers == 1:
+        for chunk in _read_chunks(input_stream, chunk_size):
+            for line in process_chunk(chunk):
+                output_stream.write(line + '\n')
+                count += 1
+        return count
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in _read_chunks(input_stream, chunk_size):
+            if len(pending) >= max_in_flight:
+                # Write the oldest chunk first so output keeps input order
+                for line in pending.popleft().result():
+                    output_stream.write(line + '\n')
+                    count += 1
+            pending.append(pool.submit(process_chunk, chunk))
+        while pending:
+            for line in pending.popleft().result():
+                output_stream.write(line + '\n')
+                count += 1
+    return count
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run JSON-lines calculator requests in bulk.")
+    parser.add_argument('input', nargs='?', default='-', help="request file (default: stdin)")
+    parser.add_argument('-o', '--output', default='-', help="response file (default: stdout)")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="worker processes (default: CPU count; 1 runs inline)")
+    parser.add_argument('-c', '--chunk-size', type=int, default=256,
+                        help="requests sent to a worker at a time")
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help="chunks queued at once (default: 2 per worker)")
+    args = parser.parse_args(argv)
+
+    if args.chunk_size < 1 or (args.workers is not None and args.workers < 1):
+        parser.error("--workers and --chunk-size must be positive")
+
+    input_stream = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    output_stream = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        run(input_stream, output_stream, args.workers, args.chunk_size, args.max_in_flight)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,318 @@
+"""
+Benchmark runner for AdvancedMathCalculator hot paths.
+
+Runs each engine method over parameterized input sizes and reports
+throughput (ops/sec) and percentiles of the per-sample mean call time
+(each sample times a batch of calls, so these show run-to-run spread, not
+the tail latency of individual calls). Results can be saved as a JSON
+baseline; later runs compared against it exit non-zero when any case slows
+down by more than the threshold or fails where the baseline succeeded.
+
+Usage:
+    python calculator_bench.py --save-baseline bench_baseline.json
+    python calculator_bench.py --baseline bench_baseline.json --threshold 0.25
+    python calculator_bench.py --filter matrix --quick
+    python calculator_bench.py --concurrency 1,2,4,8
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from calculator_engine import AdvancedMathCalculator, StatelessCalculator, np
+
+
+def _rng(size: int) -> random.Random:
+    return random.Random(1000 + size)
+
+
+def _matrix(n: int) -> List[List[float]]:
+    rng = _rng(n)
+    # Diagonally dominant so every solver case stays well conditioned
+    return [[rng.uniform(-1, 1) + (n if i == j else 0) for j in range(n)] for i in range(n)]
+
+
+def _data(n: int) -> List[float]:
+    rng = _rng(n)
+    return [rng.gauss(0, 1) for _ in range(n)]
+
+
+def _poly(degree: int) -> List[float]:
+    rng = _rng(degree)
+    return [rng.uniform(-1, 1) for _ in range(degree + 1)]
+
+
+# (case name, size parameter, sizes, quick sizes, factory returning a zero-arg callable)
+BENCHMARKS: List[Tuple[str, str, List[int], List[int], Callable]] = [
+    ('polynomial_evaluate', 'degree', [4, 32], [4],
+     lambda calc, d: (lambda c=_poly(d): calc.polynomial_evaluate(c, 0.7))),
+    ('polynomial_evaluate_batch', 'points', [1000, 100000], [1000],
+     lambda calc, n: (lambda c=_poly(8), xs=_data(n): calc.polynomial_evaluate_batch(c, xs))),
+    ('numerical_integral_trapezoid', 'n', [1000, 100000], [1000],
+     lambda calc, n: (lambda c=_poly(6): calc.numerical_integral_trapezoid(c, -1, 2, n))),
+    ('numerical_integral_simpson', 'n', [1000, 100000], [1000],
+     lambda calc, n: (lambda c=_poly(6): calc.numerical_integral_simpson(c, -1, 2, n))),
+    ('polynomial_integral', 'degree', [8, 128], [8],
+     lambda calc, d: (lambda c=_poly(d): calc.polynomial_integral(c, -1, 2))),
+    ('adaptive_integral', 'tolerance_exp', [8, 12], [8],
+     lambda calc, t: (lambda: calc.adaptive_integral(math.sin, 0, 10, 10.0 ** -t))),
+    ('find_polynomial_roots_newton', 'degree', [5, 10], [5],
+     lambda calc, d: (lambda c=_poly(d): calc.find_polynomial_roots_newton(c))),
+    ('find_polynomial_roots', 'degree', [5, 10, 40], [5],
+     lambda calc, d: (lambda c=_poly(d): calc.find_polynomial_roots(c))),
+    ('matrix_multiply', 'order', [10, 50, 200], [10],
+     lambda calc, n: (lambda m=_matrix(n): calc.matrix_multiply(m, m))),
+    ('matrix_determinant', 'order', [3, 50, 200], [3],
+     lambda calc, n: (lambda m=_matrix(n): calc.matrix_determinant(m))),
+    ('matrix_inverse', 'order', [10, 50], [10],
+     lambda calc, n: (lambda m=_matrix(n): calc.matrix_inverse(m))),
+    ('solve_linear_system', 'order', [10, 100], [10],
+     lambda calc, n: (lambda m=_matrix(n), b=_data(n): calc.solve_linear_system(m, b))),
+    ('lu_solve', 'order', [10, 100], [10],
+     lambda calc, n: (lambda lu=calc.lu_factorize(_matrix(n)), b=_data(n): lu.solve(b))),
+    ('standard_deviation', 'length', [1000, 100000], [1000],
+     lambda calc, n: (lambda d=_data(n): calc.standard_deviation(d))),
+    ('calculate_skewness', 'length', [1000, 100000], [1000],
+     lambda calc, n: (lambda d=_data(n): calc.calculate_skewness(d))),
+    ('calculate_kurtosis', 'length', [1000, 100000], [1000],
+     lambda calc, n: (lambda d=_data(n): calc.calculate_kurtosis(d))),
+    ('streaming_statistics', 'length', [1000, 100000], [1000],
+     lambda calc, n: (lambda d=_data(n): calc.streaming_statistics([d]))),
+    ('calculate_quartiles', 'length', [1000, 100000], [1000],
+     lambda calc, n: (lambda d=_data(n): calc.calculate_quartiles(d))),
+    ('calculate_quartiles_select', 'length', [1000, 100000], [1000],
+     lambda calc, n: (lambda d=_data(n): calc.calculate_quartiles(d, 'select'))),
+    ('streaming_quartiles', 'length', [1000, 100000], [1000],
+     lambda calc, n: (lambda d=_data(n): calc.streaming_quartiles([d]))),
+    ('combination', 'n', [100, 10000], [100],
+     lambda calc, n: (lambda: calc.combination(n, n // 3))),
+    ('evaluate_expression', 'variables', [1, 4], [1],
+     lambda calc, v: (lambda env={f'x{i}': i + 0.5 for i in range(v)}:
+                      calc.evaluate_expression(' + '.join(f'sin(x{i})^2' for i in range(v)), env))),
+    ('vector_angle_between', 'dimension', [3, 1000], [3],
+     lambda calc, d: (lambda a=_data(d), b=_data(d + 1)[:d]: calc.vector_angle_between(a, b))),
+    ('solve_quadratic', 'calls', [1], [1],
+     lambda calc, _: (lambda: calc.solve_quadratic(1.0, -3.0, 2.0))),
+    ('solve_cubic', 'calls', [1], [1],
+     lambda calc, _: (lambda: calc.solve_cubic(1.0, -6.0, 11.0, -6.0))),
+    ('polynomial_multiply', 'degree', [16, 1024], [16],
+     lambda calc, n: (lambda p=_poly(n), q=_poly(n + 1)[1:]: calc.polynomial_multiply(p, q))),
+    ('polynomial_evaluate_compiled', 'degree', [4, 64], [4],
+     lambda calc, n: (lambda p=calc.polynomial(_poly(n)): calc.polynomial_evaluate(p, 0.5))),
+    ('gradient', 'dimension', [2, 32], [2],
+     lambda calc, n: (lambda x=_data(n): calc.gradient(lambda p: sum(v * v for v in p), x))),
+    ('find_root', 'calls', [1], [1],
+     lambda calc, _: (lambda: calc.find_root(math.cos, 0.0, 3.0))),
+    ('find_root_batch', 'problems', [1000, 100000], [1000],
+     lambda calc, n: (lambda q=[abs(v) + 0.1 for v in _data(n)]:
+                      calc.find_root_batch(lambda xs, qs: [x * x - c for x, c in zip(xs, qs)],
+                                           [0.0] * n, [10.0] * n, (q,)))),
+    ('trigonometric', 'calls', [1], [1],
+     lambda calc, _: (lambda: calc.trigonometric(30.0, 'sin', 'deg'))),
+    ('trigonometric_array', 'length', [1000, 100000], [1000],
+     lambda calc, n: (lambda x=_data(n), k=calc.resolve_kernel('trigonometric', 'sin', 'deg'): k(x))),
+    ('special_function_batch', 'length', [1000, 100000], [1000],
+     lambda calc, n: (lambda x=_data(n): calc.special_function_batch('erf', x))),
+    ('solve_cubic_batch', 'equations', [1000, 100000], [1000],
+     lambda calc, n: (lambda a=[1.0] * n, b=_data(n), c=_data(n + 1)[1:], d=_data(n + 2)[2:]:
+                      calc.solve_cubic_batch(a, b, c, d))),
+]
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return math.nan
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(func: Callable, min_time: float, min_samples: int = 5) -> Dict:
+    """
+    Time func: calls are grouped into samples of at least ~1 ms so timer
+    resolution does not dominate, and sampling continues until both
+    min_time and min_samples are reached. The sample_* figures are
+    percentiles over those per-sample mean call times.
+    """
+    func()  # warm-up (caches, lazy imports)
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= 1e-3 or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    sample_means = []
+    total_time = 0.0
+    total_calls = 0
+    while total_time < min_time or len(sample_means) < min_samples:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        sample_means.append(elapsed / loops)
+        total_time += elapsed
+        total_calls += loops
+
+    sample_means.sort()
+    return {
+        'ops_per_sec': total_calls / total_time,
+        'calls': total_calls,
+        'calls_per_sample': loops,
+        'sample_p50_ms': _percentile(sample_means, 0.50) * 1e3,
+        'sample_p90_ms': _percentile(sample_means, 0.90) * 1e3,
+        'sample_p99_ms': _percentile(sample_means, 0.99) * 1e3,
+        'sample_max_ms': sample_means[-1] * 1e3,
+    }
+
+
+def run_benchmarks(name_filter: str = None, quick: bool = False,
+                   min_time: float = 0.5, stream=sys.stdout) -> Dict[str, Dict]:
+    """Run every matching case and return {case_id: measurement}."""
+    calc = AdvancedMathCalculator()
+    results = {}
+    for name, param, sizes, quick_sizes, factory in BENCHMARKS:
+        if name_filter and name_filter not in name:
+            continue
+        for size in (quick_sizes if quick else sizes):
+            case_id = f"{name}[{param}={size}]"
+            calc.error_message = ""
+            result = measure(factory(calc, size), min_time)
+            if calc.error_message:
+                result['error'] = calc.error_message
+            results[case_id] = result
+            if stream is not None:
+                stream.write(f"{case_id:<52} {result['ops_per_sec']:>14,.1f} ops/s   "
+                             f"sample p50 {result['sample_p50_ms']:.4f} ms   "
+                             f"p99 {result['sample_p99_ms']:.4f} ms"
+                             f"{'   ERROR: ' + result['error'] if 'error' in result else ''}\n")
+                stream.flush()
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict],
+            threshold: float) -> List[str]:
+    """
+    Return a description of every case slower than baseline by more than
+    threshold, or failing where the baseline did not (a case that errors
+    out early would otherwise look like a speedup).
+    """
+    regressions = []
+    for case_id, result in results.items():
+        reference = baseline.get(case_id)
+        if not reference:
+            continue
+        if 'error' in result and 'error' not in reference:
+            regressions.append(f"{case_id}: now fails: {result['error']}")
+            continue
+        ratio = result['ops_per_sec'] / reference['ops_per_sec']
+        if ratio < 1 - threshold:
+            regressions.append(f"{case_id}: {reference['ops_per_sec']:,.1f} -> "
+                               f"{result['ops_per_sec']:,.1f} ops/s ({(ratio - 1) * 100:+.1f}%)")
+    return regressions
+
+
+# Mixed workload for the thread-scaling benchmark: (operation, args)
+CONCURRENCY_WORKLOAD = [
+    ('solve_quadratic', (1.0, -3.0, 2.0)),
+    ('matrix_determinant', (_matrix(12),)),
+    ('standard_deviation', (_data(500),)),
+    ('find_polynomial_roots', (_poly(6),)),
+    ('basic_operations', (1.0, 0.0, '/')),  # exercises the error path
+]
+
+
+def run_concurrency_benchmark(thread_counts: List[int], duration: float = 1.0,
+                              stream=sys.stdout) -> Dict[int, Dict]:
+    """
+    Share one StatelessCalculator across a ThreadPoolExecutor and report
+    throughput per thread count. Scaling beyond one thread needs a
+    free-threaded (no-GIL) CPython build; with the GIL it stays flat.
+    """
+    calc = StatelessCalculator()
+    results = {}
+    for threads in thread_counts:
+        stop = threading.Event()
+
+        def worker():
+            calls = 0
+            while not stop.is_set():
+                for operation, args in CONCURRENCY_WORKLOAD:
+                    calc.call(operation, *args)
+                calls += len(CONCURRENCY_WORKLOAD)
+            return calls
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            start = time.perf_counter()
+            futures = [pool.submit(worker) for _ in range(threads)]
+            time.sleep(duration)
+            stop.set()
+            total = sum(f.result() for f in futures)
+            elapsed = time.perf_counter() - start
+
+        results[threads] = {'threads': threads, 'ops_per_sec': total / elapsed}
+        baseline = results[thread_counts[0]]['ops_per_sec']
+        results[threads]['speedup'] = results[threads]['ops_per_sec'] / baseline
+        if stream is not None:
+            stream.write(f"threads={threads:<4} {results[threads]['ops_per_sec']:>14,.1f} ops/s   "
+                         f"x{results[threads]['speedup']:.2f}\n")
+            stream.flush()
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark AdvancedMathCalculator methods.")
+    parser.add_argument('--filter', help="only run cases whose name contains this text")
+    parser.add_argument('--quick', action='store_true', help="run only the smallest sizes")
+    parser.add_argument('--min-time', type=float, default=0.5,
+                        help="seconds spent measuring each case (default: 0.5)")
+    parser.add_argument('--save-baseline', metavar='PATH', help="write results as a JSON baseline")
+    parser.add_argument('--baseline', metavar='PATH', help="compare against a saved baseline")
+    parser.add_argument('--threshold', type=float, default=0.20,
+                        help="allowed fractional slowdown before failing (default: 0.20)")
+    parser.add_argument('--concurrency', metavar='COUNTS',
+                        help="comma-separated thread counts for the shared-instance scaling run")
+    args = parser.parse_args(argv)
+
+    if args.concurrency:
+        gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+        print(f"GIL {'enabled' if gil else 'disabled'}")
+        run_concurrency_benchmark([int(n) for n in args.concurrency.split(',')],
+                                  max(args.min_time, 0.1))
+        return 0
+
+    results = run_benchmarks(args.filter, args.quick, args.min_time)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'numpy': np is not None,
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,2202 @@
+import ast
+import functools
+import heapq
 import math
 import cmath
-from typing import Union, Tuple, List, Dict
+import mmap
+import numbers
+import operator
+import os
+import random
+from array import array
+from types import MappingProxyType
+from typing import Any, NamedTuple, Union, Tuple, List, Dict
 import re
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python kernels are used instead
+    np = None
+
+# Unit roundoff for IEEE-754 double precision
+_EPS = 2.220446049250313e-16
+
+def _as_float_array(values) -> array:
+    """Return a 1-D array('d') view of a buffer, array or iterable of numbers."""
+    if isinstance(values, array) and values.typecode == 'd':
+        return values
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return array('d', values)
+    result = array('d')
+    if view.format == 'd':
+        result.frombytes(view.cast('B') if view.c_contiguous else view.tobytes())
+    else:
+        result.extend(float(v) for v in view.cast('B').cast(view.format).tolist())
+    return result
+
+
+def _numeric_view(data):
+    """
+    Zero-copy 1-D view of any buffer-protocol object (memoryview, array,
+    mmap, NumPy array). Raw byte buffers such as bytes or mmap are read as
+    native float64. Lists, tuples and other iterables pass through.
+    """
+    if isinstance(data, (list, tuple, array)):
+        return data
+    try:
+        view = memoryview(data)
+    except TypeError:
+        return data
+    if view.format in ('B', 'b', 'c'):
+        if view.nbytes % 8:
+            raise ValueError("Byte buffer length is not a multiple of 8 (float64)")
+        return view.cast('B').cast('d')
+    if view.ndim != 1:
+        return view.cast('B').cast(view.format)
+    return view
+
+
+def _sample_grid(a: float, b: float, n: int):
+    """Build the n+1 equally spaced sample points of [a, b] in one shot."""
+    h = (b - a) / n
+    if np is not None:
+        return a + h * np.arange(n + 1, dtype=float)
+    return array('d', [a + i * h for i in range(n + 1)])
+
+
+class FlatMatrix:
+    """
+    Dense matrix over flat array('d') storage with explicit strides.
+    Transposition swaps the strides and shares the underlying buffer.
+    """
+    
+    def __init__(self, data: array, rows: int, cols: int,
+                 row_stride: int = None, col_stride: int = 1, offset: int = 0):
+        self.data = data
+        self.rows = rows
+        self.cols = cols
+        self.row_stride = cols if row_stride is None else row_stride
+        self.col_stride = col_stride
+        self.offset = offset
+    
+    @classmethod
+    def from_rows(cls, matrix: List[List[float]]) -> 'FlatMatrix':
+        """Pack a nested-list matrix into row-major storage."""
+        if isinstance(matrix, cls):
+            return matrix
+        rows = len(matrix)
+        cols = len(matrix[0]) if rows else 0
+        data = array('d')
+        for row in matrix:
+            if len(row) != cols:
+                raise ValueError("All rows must have the same length")
+            data.extend(row)
+        return cls(data, rows, cols)
+    
+    @property
+    def T(self) -> 'FlatMatrix':
+        """Zero-copy transposed view."""
+        return FlatMatrix(self.data, self.cols, self.rows,
+                          self.col_stride, self.row_stride, self.offset)
+    
+    def is_contiguous(self) -> bool:
+        return self.col_stride == 1 and self.row_stride == self.cols
+    
+    def __getitem__(self, index: Tuple[int, int]) -> float:
+        i, j = index
+        return self.data[self.offset + i * self.row_stride + j * self.col_stride]
+    
+    def row(self, i: int) -> array:
+        """Row i as an array('d') slice."""
+        start = self.offset + i * self.row_stride
+        if self.cols == 0:
+            return array('d')
+        return self.data[start:start + (self.cols - 1) * self.col_stride + 1:self.col_stride]
+    
+    def contiguous(self) -> 'FlatMatrix':
+        """Return self if row-major contiguous, otherwise a packed copy."""
+        if self.is_contiguous() and self.offset == 0:
+            return self
+        data = array('d')
+        for i in range(self.rows):
+            data.extend(self.row(i))
+        return FlatMatrix(data, self.rows, self.cols)
+    
+    def to_rows(self) -> List[List[float]]:
+        """Unpack into a nested-list matrix."""
+        return [self.row(i).tolist() for i in range(self.rows)]
+
+
+def _float_rows(matrix) -> bool:
+    """True when every entry of a nested-list matrix is a float (float64 matmul is exact enough)."""
+    return all(isinstance(v, float) for row in matrix for v in row)
+
+
+def _matmul_operand(matrix):
+    """
+    ndarray for NumPy matmul. Integer entries are promoted to float to avoid
+    silent int64 overflow; complex entries stay complex, and big ints or
+    Fractions become an object array multiplied exactly.
+    """
+    a = np.asarray(matrix.to_rows() if isinstance(matrix, FlatMatrix) else matrix)
+    return a.astype(float) if a.dtype.kind in 'biu' else a
+
+
+def _tiled_matmul(a: FlatMatrix, b: FlatMatrix, block_size: int = 256) -> FlatMatrix:
+    """
+    Blocked product over strided flat storage (pure-Python kernel).
+    Columns of b are sliced out of the buffer one block at a time and each
+    entry is a C-level sum(map(mul)) over a row and a column.
+    """
+    rows = [a.row(i) for i in range(a.rows)]
+    b_t = b.T
+    p = b.cols
+    out = array('d', bytes(8 * a.rows * p))
+    
+    for j0 in range(0, p, block_size):
+        j1 = min(j0 + block_size, p)
+        columns = [b_t.row(j) for j in range(j0, j1)]
+        for i, row in enumerate(rows):
+            out[i * p + j0:i * p + j1] = array(
+                'd', [sum(map(operator.mul, row, col)) for col in columns])
+    
+    return FlatMatrix(out, a.rows, p)
+
+
+class LUFactorization:
+    """
+    LU decomposition with partial pivoting: P·A = L·U.
+    Factor once in O(n³), then solve each right-hand side in O(n²).
+    """
+    
+    def __init__(self, matrix: List[List[float]]):
+        n = len(matrix)
+        if n == 0 or any(len(row) != n for row in matrix):
+            raise ValueError("LU factorization requires a non-empty square matrix")
+        
+        scale = max(abs(v) for row in matrix for v in row)
+        # Pivots below this are treated as exact zeros (rank deficiency)
+        self.tolerance = n * _EPS * scale
+        self.n = n
+        self.singular = False
+        swaps = 0
+        
+        if np is not None:
+            a = np.array(matrix, dtype=float)
+            perm = np.arange(n)
+            for k in range(n):
+                p = k + int(np.argmax(np.abs(a[k:, k])))
+                if p != k:
+                    a[[k, p]] = a[[p, k]]
+                    perm[[k, p]] = perm[[p, k]]
+                    swaps += 1
+                if abs(a[k, k]) <= self.tolerance:
+                    self.singular = True
+                    continue
+                a[k+1:, k] /= a[k, k]
+                a[k+1:, k+1:] -= np.outer(a[k+1:, k], a[k, k+1:])
+            self.lu = a.tolist()
+            self.perm = perm.tolist()
+        else:
+            a = [[float(v) for v in row] for row in matrix]
+            perm = list(range(n))
+            for k in range(n):
+                p = max(range(k, n), key=lambda i: abs(a[i][k]))
+                if p != k:
+                    a[k], a[p] = a[p], a[k]
+                    perm[k], perm[p] = perm[p], perm[k]
+                    swaps += 1
+                pivot_row = a[k]
+                pivot = pivot_row[k]
+                if abs(pivot) <= self.tolerance:
+                    self.singular = True
+                    continue
+                tail = pivot_row[k+1:]
+                for i in range(k + 1, n):
+                    row = a[i]
+                    factor = row[k] / pivot
+                    if factor:
+                        row[k] = factor
+                        row[k+1:] = [x - factor * y for x, y in zip(row[k+1:], tail)]
+                    else:
+                        row[k] = 0.0
+            self.lu = a
+            self.perm = perm
+        
+        self.sign = -1 if swaps % 2 else 1
+    
+    def determinant(self) -> float:
+        """Determinant from the product of U's diagonal."""
+        if self.singular:
+            return 0.0
+        det = float(self.sign)
+        for i in range(self.n):
+            det *= self.lu[i][i]
+        return det
+    
+    def solve(self, constants: List[float]) -> List[float]:
+        """Solve A·x = b by forward and back substitution."""
+        if self.singular:
+            raise ValueError("Matrix is singular")
+        n = self.n
+        if len(constants) != n:
+            raise ValueError(f"Expected {n} constants, got {len(constants)}")
+        
+        lu = self.lu
+        y = [0.0] * n
+        for i in range(n):
+            y[i] = constants[self.perm[i]] - sum(map(operator.mul, lu[i][:i], y[:i]))
+        
+        x = [0.0] * n
+        for i in range(n - 1, -1, -1):
+            row = lu[i]
+            x[i] = (y[i] - sum(map(operator.mul, row[i+1:], x[i+1:]))) / row[i]
+        return x
+    
+    def inverse(self) -> List[List[float]]:
+        """Inverse matrix, solving one unit column at a time."""
+        n = self.n
+        columns = []
+        for j in range(n):
+            unit = [0.0] * n
+            unit[j] = 1.0
+            columns.append(self.solve(unit))
+        return [[columns[j][i] for j in range(n)] for i in range(n)]
+
+
+def _horner_with_derivative(rev_coeffs: List[complex], abs_coeffs: List[float], z: complex):
+    """Evaluate p(z), p'(z) and the rounding-error scale sum |aᵢ||z|ⁱ together."""
+    p = dp = 0j
+    scale = 0.0
+    az = abs(z)
+    for c, ac in zip(rev_coeffs, abs_coeffs):
+        dp = dp * z + p
+        p = p * z + c
+        scale = scale * az + ac
+    return p, dp, scale
+
+
+def _aberth_roots(coefficients: List[float], tolerance: float, max_iterations: int):
+    """
+    Find all complex roots simultaneously with the Aberth–Ehrlich iteration.
+    coefficients are in ascending order [a₀, a₁, ...].
+    Returns (roots, error_bounds, iterations, converged).
+    """
+    coeffs = [complex(c) for c in coefficients]
+    while coeffs and coeffs[-1] == 0:
+        coeffs.pop()
+    if len(coeffs) < 2:
+        raise ValueError("Polynomial must have degree at least 1")
+    is_real = all(c.imag == 0 for c in coeffs)
+    
+    # Factor out x^k exactly instead of iterating towards zero roots
+    zero_roots = 0
+    while coeffs[0] == 0:
+        coeffs.pop(0)
+        zero_roots += 1
+    
+    roots = [0j] * zero_roots
+    bounds = [0.0] * zero_roots
+    n = len(coeffs) - 1
+    if n == 0:
+        return roots, bounds, 0, True
+    
+    lead = coeffs[-1]
+    rev = [c / lead for c in reversed(coeffs)]
+    abs_rev = [abs(c) for c in rev]
+    
+    # Start on a circle around the roots' centroid, radius from |a₀|^(1/n)
+    center = -rev[1] / n
+    radius = max(abs(rev[-1]) ** (1.0 / n), _EPS)
+    z = [center + radius * cmath.exp(1j * (2 * math.pi * k / n + 0.4)) for k in range(n)]
+    active = [True] * n
+    
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        for k in range(n):
+            if not active[k]:
+                continue
+            zk = z[k]
+            p, dp, scale = _horner_with_derivative(rev, abs_rev, zk)
+            if abs(p) <= 4 * n * _EPS * scale:
+                active[k] = False
+                continue
+            if dp == 0:
+                z[k] = zk + radius * _EPS ** 0.5
+                continue
+            ratio = p / dp
+            repulsion = sum(1 / (zk - zj) for j, zj in enumerate(z) if j != k and zk != zj)
+            step = ratio / (1 - ratio * repulsion)
+            z[k] = zk - step
+            if abs(step) <= tolerance * max(abs(z[k]), 1.0):
+                active[k] = False
+        if not any(active):
+            break
+    converged = not any(active)
+    
+    # Polish with one Newton step and attach an inclusion radius per root
+    for k in range(n):
+        p, dp, scale = _horner_with_derivative(rev, abs_rev, z[k])
+        if dp != 0:
+            candidate = z[k] - p / dp
+            p2, dp2, scale2 = _horner_with_derivative(rev, abs_rev, candidate)
+            if abs(p2) < abs(p) and dp2 != 0:
+                z[k], p, dp, scale = candidate, p2, dp2, scale2
+        if dp == 0:
+            bound = math.inf
+        else:
+            bound = n * (abs(p) + 4 * n * _EPS * scale) / abs(dp)
+        if is_real and abs(z[k].imag) <= bound:
+            z[k] = complex(z[k].real, 0.0)
+        roots.append(z[k])
+        bounds.append(bound)
+    
+    order = sorted(range(len(roots)), key=lambda i: (roots[i].real, roots[i].imag))
+    return [roots[i] for i in order], [bounds[i] for i in order], iterations, converged
+
+
+# Polynomial products leave the schoolbook kernel once both factors have at
+# least this many coefficients: integers go through one big-integer product,
+# floats through an FFT convolution (which pays off later in pure Python)
+_KRONECKER_MULTIPLY_THRESHOLD = 32
+_FFT_MULTIPLY_THRESHOLD = 128
+# Straight-line Horner evaluators are generated up to this degree
+_COMPILED_HORNER_MAX_DEGREE = 512
+
+
+def _schoolbook_multiply(a: List, b: List) -> List:
+    """c_k = Σ a_i·b_(k-i), one sum(map(mul)) per output coefficient."""
+    la, lb = len(a), len(b)
+    b_rev = b[::-1]
+    result = []
+    for k in range(la + lb - 1):
+        lo, hi = max(0, k - lb + 1), min(k, la - 1) + 1
+        offset = lb - 1 - k
+        result.append(sum(map(operator.mul, a[lo:hi], b_rev[lo + offset:hi + offset])))
+    return result
+
+
+def _kronecker_multiply(a: List[int], b: List[int]) -> List[int]:
+    """
+    Exact integer product by Kronecker substitution: pack each polynomial
+    into one big integer, multiply once, and unpack the coefficients.
+    """
+    bound = max(map(abs, a)) * max(map(abs, b)) * min(len(a), len(b))
+    width = (bound.bit_length() + 9) // 8  # bytes per coefficient, with a sign bit spare
+    one, zero = (1).to_bytes(width, 'little'), bytes(width)
+    
+    def pack(coeffs):
+        # Two's-complement chunks; each negative chunk borrows one from the next
+        value = int.from_bytes(b''.join(c.to_bytes(width, 'little', signed=True)
+                                        for c in coeffs), 'little')
+        borrow = int.from_bytes(zero + b''.join(one if c < 0 else zero for c in coeffs), 'little')
+        return value - borrow
+    
+    product = pack(a) * pack(b)
+    sign = -1 if product < 0 else 1
+    data = abs(product).to_bytes(width * (len(a) + len(b)), 'little')
+    half, full = 1 << (8 * width - 1), 1 << (8 * width)
+    result, carry = [], 0
+    for i in range(len(a) + len(b) - 1):
+        digit = int.from_bytes(data[i * width:(i + 1) * width], 'little') + carry
+        carry = 0
+        if digit >= half:
+            digit -= full
+            carry = 1
+        result.append(sign * digit)
+    return result
+
+
+def _fft_multiply(a: List, b: List) -> List:
+    """Floating-point product via FFT convolution (absolute error ~ ε·n·max|a|·max|b|)."""
+    n = len(a) + len(b) - 1
+    is_real = not any(isinstance(c, complex) for c in (*a, *b))
+    if np is not None:
+        if is_real:
+            size = 1 << (n - 1).bit_length()
+            return np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)[:n].tolist()
+        size = 1 << (n - 1).bit_length()
+        return np.fft.ifft(np.fft.fft(a, size) * np.fft.fft(b, size))[:n].tolist()
+    size = 1 << (n - 1).bit_length()
+    fa = _fft_radix2([complex(c) for c in a] + [0j] * (size - len(a)), False)
+    fb = _fft_radix2([complex(c) for c in b] + [0j] * (size - len(b)), False)
+    product = _fft_radix2([x * y for x, y in zip(fa, fb)], True)
+    if is_real:
+        return [z.real / size for z in product[:n]]
+    return [z / size for z in product[:n]]
+
+
+def _multiply_coefficients(a: List, b: List) -> List:
+    shortest = min(len(a), len(b))
+    if shortest >= _KRONECKER_MULTIPLY_THRESHOLD and all(type(c) is int for c in a + b):
+        return _kronecker_multiply(a, b)
+    if shortest >= _FFT_MULTIPLY_THRESHOLD:
+        return _fft_multiply(a, b)
+    return _schoolbook_multiply(a, b)
+
+
+def _compile_horner(coefficients: Tuple):
+    """
+    Build a straight-line Horner function for these coefficients, so each
+    evaluation runs without loop or indexing overhead.
+    """
+    n = len(coefficients) - 1
+    if n > _COMPILED_HORNER_MAX_DEGREE:
+        rev = coefficients[::-1]
+        
+        def horner(x):
+            result = rev[0]
+            for coef in rev[1:]:
+                result = result * x + coef
+            return result
+        return horner
+    
+    lines = ['def horner(x):', f'    r = c{n}']
+    lines += [f'    r = r * x + c{i}' for i in range(n - 1, -1, -1)]
+    lines.append('    return r')
+    namespace = {'__builtins__': {}, **{f'c{i}': c for i, c in enumerate(coefficients)}}
+    exec(compile('\n'.join(lines), '<horner>', 'exec'), namespace)
+    return namespace['horner']
+
+
+class Polynomial:
+    """
+    Immutable polynomial a₀ + a₁x + a₂x² + ... (coefficients ascending,
+    trailing zeros trimmed). The derivative, antiderivative and a compiled
+    Horner evaluator are built on first use and cached. Behaves as a
+    read-only sequence of coefficients, so it can be passed anywhere a
+    coefficient list is accepted.
+    """
+    __slots__ = ('coefficients', '_derivative', '_antiderivative', '_evaluator')
+    
+    def __init__(self, coefficients):
+        if isinstance(coefficients, Polynomial):
+            coeffs = list(coefficients.coefficients)
+        else:
+            coeffs = list(coefficients)
+        while len(coeffs) > 1 and coeffs[-1] == 0:
+            coeffs.pop()
+        self.coefficients = tuple(coeffs) or (0,)
+        self._derivative = None
+        self._antiderivative = None
+        self._evaluator = None
+    
+    @property
+    def degree(self) -> int:
+        """Degree of the polynomial (-1 for the zero polynomial)."""
+        if len(self.coefficients) == 1 and self.coefficients[0] == 0:
+            return -1
+        return len(self.coefficients) - 1
+    
+    def __len__(self) -> int:
+        return len(self.coefficients)
+    
+    def __getitem__(self, index):
+        return self.coefficients[index]
+    
+    def __iter__(self):
+        return iter(self.coefficients)
+    
+    def __reversed__(self):
+        return reversed(self.coefficients)
+    
+    def __hash__(self) -> int:
+        return hash(self.coefficients)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Polynomial):
+            return self.coefficients == other.coefficients
+        if isinstance(other, (int, float, complex)):
+            return self.coefficients == (other,)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"Polynomial({list(self.coefficients)})"
+    
+    def to_list(self) -> List:
+        return list(self.coefficients)
+    
+    def to_dict(self) -> Dict:
+        return {'coefficients': list(self.coefficients), 'degree': self.degree}
+    
+    # --- calculus (cached) ---
+    
+    def derivative(self) -> 'Polynomial':
+        if self._derivative is None:
+            c = self.coefficients
+            self._derivative = Polynomial([i * c[i] for i in range(1, len(c))] or [0])
+        return self._derivative
+    
+    def antiderivative(self) -> 'Polynomial':
+        """Antiderivative with constant term 0."""
+        if self._antiderivative is None:
+            self._antiderivative = Polynomial(
+                [0] + [coef / (i + 1) for i, coef in enumerate(self.coefficients)])
+        return self._antiderivative
+    
+    def integral(self, a: float, b: float) -> float:
+        F = self.antiderivative()
+        return F(b) - F(a)
+    
+    # --- evaluation ---
+    
+    def __call__(self, x):
+        """p(x) for a number, or the composition p(q(x)) for a Polynomial q."""
+        if isinstance(x, Polynomial):
+            return self.compose(x)
+        if self._evaluator is None:
+            self._evaluator = _compile_horner(self.coefficients)
+        return self._evaluator(x)
+    
+    def evaluate_many(self, xs):
+        """
+        Batched Horner over all points: one vectorised pass per coefficient.
+        Returns a NumPy array when NumPy is available, otherwise array('d').
+        """
+        rev = self.coefficients[::-1]
+        if np is not None:
+            points = np.asarray(xs, dtype=float)
+            result = np.full_like(points, rev[0])
+            for coef in rev[1:]:
+                result *= points
+                result += coef
+            return result
+        points = _as_float_array(xs)
+        result = [float(rev[0])] * len(points)
+        for coef in rev[1:]:
+            result = [r * x + coef for r, x in zip(result, points)]
+        return array('d', result)
+    
+    # --- arithmetic ---
+    
+    @staticmethod
+    def _coerce(other):
+        if isinstance(other, Polynomial):
+            return other
+        if isinstance(other, (int, float, complex)):
+            return Polynomial([other])
+        if isinstance(other, (list, tuple, array)):
+            return Polynomial(other)
+        return None
+    
+    def __add__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        a, b = self.coefficients, other.coefficients
+        if len(a) < len(b):
+            a, b = b, a
+        return Polynomial([x + y for x, y in zip(a, b)] + list(a[len(b):]))
+    
+    __radd__ = __add__
+    
+    def __neg__(self) -> 'Polynomial':
+        return Polynomial([-c for c in self.coefficients])
+    
+    def __sub__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self + (-other)
+    
+    def __rsub__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return other + (-self)
+    
+    def __mul__(self, other):
+        if isinstance(other, (int, float, complex)):
+            return Polynomial([c * other for c in self.coefficients])
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return Polynomial(_multiply_coefficients(list(self.coefficients),
+                                                 list(other.coefficients)))
+    
+    __rmul__ = __mul__
+    
+    def __pow__(self, exponent: int) -> 'Polynomial':
+        if not isinstance(exponent, int) or exponent < 0:
+            return NotImplemented
+        result, base = Polynomial([1]), self
+        while exponent:
+            if exponent & 1:
+                result = result * base
+            exponent >>= 1
+            if exponent:
+                base = base * base
+        return result
+    
+    def __divmod__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        divisor = other.coefficients
+        if other.degree < 0:
+            raise ZeroDivisionError("Polynomial division by zero")
+        remainder = list(self.coefficients)
+        lb = len(divisor)
+        if len(remainder) < lb:
+            return Polynomial([0]), Polynomial(remainder)
+        
+        lead = divisor[-1]
+        exact = type(lead) is int and abs(lead) == 1
+        quotient = [0] * (len(remainder) - lb + 1)
+        for i in range(len(quotient) - 1, -1, -1):
+            top = remainder[i + lb - 1]
+            q = top * lead if exact else top / lead
+            quotient[i] = q
+            if q:
+                for j in range(lb - 1):
+                    remainder[i + j] -= q * divisor[j]
+        return Polynomial(quotient), Polynomial(remainder[:lb - 1] or [0])
+    
+    def __floordiv__(self, other):
+        result = self.__divmod__(other)
+        return result if result is NotImplemented else result[0]
+    
+    def __mod__(self, other):
+        result = self.__divmod__(other)
+        return result if result is NotImplemented else result[1]
+    
+    def compose(self, inner) -> 'Polynomial':
+        """p(q(x)) by Horner's scheme over polynomials."""
+        inner = self._coerce(inner)
+        rev = self.coefficients[::-1]
+        result = Polynomial([rev[0]])
+        for coef in rev[1:]:
+            result = result * inner + coef
+        return result
+
+
+def _polynomial_like(result: Polynomial, *inputs):
+    """Hand back a plain list when every input was a plain coefficient sequence."""
+    if any(isinstance(p, Polynomial) for p in inputs):
+        return result
+    return result.to_list()
+
+
+# Gauss–Kronrod 7/15 abscissae and weights on [-1, 1] (QUADPACK qk15)
+_GK15_NODES = (
+    0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+    0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+    0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+    0.207784955007898467600689403773245, 0.0,
+)
+_GK15_KRONROD_WEIGHTS = (
+    0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649, 0.209482141084727828012999174891714,
+)
+# Weights of the embedded 7-point Gauss rule at the odd-indexed Kronrod nodes
+_GK15_GAUSS_WEIGHTS = (
+    0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975, 0.417959183673469387755102040816327,
+)
+
+
+def _gauss_kronrod_15(func, a: float, b: float):
+    """Integrate func over [a, b]; return (kronrod_value, |kronrod - gauss|)."""
+    center = (a + b) / 2
+    half = (b - a) / 2
+    xs = [center - half * x for x in _GK15_NODES[:-1]] + [center]
+    xs += [center + half * x for x in reversed(_GK15_NODES[:-1])]
+    ys = func(xs)
+    
+    kronrod = ys[7] * _GK15_KRONROD_WEIGHTS[7]
+    gauss = ys[7] * _GK15_GAUSS_WEIGHTS[3]
+    for i in range(7):
+        pair = ys[i] + ys[14 - i]
+        kronrod += pair * _GK15_KRONROD_WEIGHTS[i]
+        if i % 2 == 1:
+            gauss += pair * _GK15_GAUSS_WEIGHTS[i // 2]
+    return kronrod * half, abs((kronrod - gauss) * half)
+
+# Ridders' method: central differences at steps h, h/1.4, h/1.4², ... combined
+# by Richardson extrapolation, keeping the entry with the smallest error estimate
+_RIDDERS_SHRINK = 1.4
+_RIDDERS_LEVELS = 10
+_RIDDERS_INITIAL_STEP = 0.1
+# An estimate whose error bound is not small relative to its magnitude has
+# straddled a feature of f (typically a pole); retry with a step this much
+# smaller, a few times at most
+_RIDDERS_RELIABLE = 1e-4
+_RIDDERS_RETRY_SHRINK = 10.0
+_RIDDERS_RETRIES = 4
+
+
+def _initial_step(x: float) -> float:
+    """
+    Automatic largest step: relative to |x| below 1 (so nearby poles are not
+    straddled), growing only logarithmically above 1, and 0.1 at x = 0.
+    """
+    ax = abs(x)
+    if ax == 0:
+        scale = 1.0
+    elif ax < 1:
+        scale = max(ax, _EPS ** 0.5)
+    else:
+        scale = max(1.0, math.log1p(ax))
+    return _RIDDERS_INITIAL_STEP * scale
+
+
+def _richardson_extrapolate(differences: List[float]):
+    """
+    Ridders' tableau over central differences at geometrically shrinking steps.
+    Levels up to the last non-finite one (failed evaluations) are skipped.
+    Returns (estimate, error_estimate).
+    """
+    start = 0
+    for i, d in enumerate(differences):
+        if not math.isfinite(d):
+            start = i + 1
+    differences = differences[start:]
+    if not differences:
+        return math.nan, math.inf
+    
+    ratio = _RIDDERS_SHRINK * _RIDDERS_SHRINK
+    previous = [differences[0]]
+    best, error = differences[0], math.inf
+    for i in range(1, len(differences)):
+        current = [differences[i]]
+        factor = ratio
+        for j in range(1, i + 1):
+            current.append((current[j - 1] * factor - previous[j - 1]) / (factor - 1))
+            factor *= ratio
+            estimate = max(abs(current[j] - current[j - 1]), abs(current[j] - previous[j - 1]))
+            if estimate <= error:
+                best, error = current[j], estimate
+        # Higher orders stopped helping: rounding error now dominates
+        if abs(current[i] - previous[i - 1]) >= 2 * error:
+            break
+        previous = current
+    return best, error
+
+
+def _point_evaluator(func, vectorized: bool, scalar_argument: bool):
+    """
+    Evaluate func at a list of points in one pass. A vectorized func gets
+    every point in a single call (an ndarray when NumPy is available);
+    otherwise func is called per point and domain errors become NaN.
+    """
+    if vectorized:
+        def evaluate(points):
+            if scalar_argument:
+                points = [p[0] for p in points]
+            return list(func(np.asarray(points, dtype=float) if np is not None else points))
+        return evaluate
+    
+    def safe(point):
+        try:
+            return func(point[0] if scalar_argument else point)
+        except (ValueError, ZeroDivisionError, OverflowError):
+            return math.nan
+    return lambda points: [safe(p) for p in points]
+
+
+def _richardson_partials(evaluate, x: List[float], steps: List[float], inputs=None):
+    """
+    Partial derivatives of every output of f with respect to every x_k
+    (or only the k in inputs). All 2·len(x)·levels perturbed points are
+    built up front and passed to evaluate in one batch. Returns
+    (estimates[k][i], errors[k][i], evaluations) for input k and output
+    component i.
+    """
+    inputs = range(len(x)) if inputs is None else inputs
+    points, spacings = [], []
+    for k in inputs:
+        xk = x[k]
+        h = steps[k]
+        for _ in range(_RIDDERS_LEVELS):
+            hk = (xk + h) - xk  # exactly representable step
+            plus, minus = list(x), list(x)
+            plus[k] = xk + hk
+            minus[k] = xk - hk
+            points += (plus, minus)
+            spacings.append(hk)
+            h /= _RIDDERS_SHRINK
+    
+    values = []
+    for value in evaluate(points):
+        try:
+            values.append((float(value),) if not hasattr(value, '__len__') else
+                          tuple(float(v) for v in value))
+        except TypeError:
+            values.append(None)
+    width = max((len(v) for v in values if v is not None), default=1)
+    nan_row = (math.nan,) * width
+    values = [v if v is not None and len(v) == width else nan_row for v in values]
+    
+    estimates, errors = [], []
+    for position in range(len(inputs)):
+        rows = range(position * _RIDDERS_LEVELS, (position + 1) * _RIDDERS_LEVELS)
+        partial, partial_error = [], []
+        for i in range(width):
+            differences = [(values[2 * r][i] - values[2 * r + 1][i]) / (2 * spacings[r])
+                           for r in rows]
+            estimate, error = _richardson_extrapolate(differences)
+            partial.append(estimate)
+            partial_error.append(error)
+        estimates.append(partial)
+        errors.append(partial_error)
+    return estimates, errors, len(points)
+
+
+def _unreliable(estimates: List[float], errors: List[float]) -> bool:
+    """True when any error bound is large relative to max(|estimate|, 1)."""
+    return any(not error <= _RIDDERS_RELIABLE * max(abs(estimate), 1.0)
+               for estimate, error in zip(estimates, errors))
+
+
+def _reliable_partials(evaluate, x: List[float], steps: List[float]):
+    """
+    _richardson_partials, re-running inputs whose estimates are unreliable
+    with a smaller step. Raises ValueError if shrinking never settles them.
+    """
+    steps = list(steps)
+    estimates, errors, evaluations = _richardson_partials(evaluate, x, steps)
+    for _ in range(_RIDDERS_RETRIES):
+        retry = [k for k in range(len(x)) if _unreliable(estimates[k], errors[k])]
+        if not retry:
+            return estimates, errors, evaluations
+        for k in retry:
+            steps[k] /= _RIDDERS_RETRY_SHRINK
+        retried, retried_errors, count = _richardson_partials(evaluate, x, steps, retry)
+        evaluations += count
+        for k, partial, partial_error in zip(retry, retried, retried_errors):
+            estimates[k], errors[k] = partial, partial_error
+    if any(_unreliable(estimates[k], errors[k]) for k in range(len(x))):
+        raise ValueError("Derivative did not converge: error estimate is too large "
+                         "(f may have a pole or discontinuity near x)")
+    return estimates, errors, evaluations
+
+class BracketedRoots:
+    """
+    Batch bracketed-root results as parallel arrays, one entry per problem:
+    the root estimate, iterations used, final bracket width and a
+    convergence flag. Problems whose bracket had no sign change report
+    NaN, zero iterations and converged False.
+    """
+    __slots__ = ('root', 'iterations', 'bracket_width', 'converged')
+    
+    def __init__(self, root, iterations, bracket_width, converged):
+        self.root = root
+        self.iterations = iterations
+        self.bracket_width = bracket_width
+        self.converged = converged
+    
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __len__(self) -> int:
+        return len(self.root)
+    
+    def to_dict(self) -> Dict:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+def _bracket_tolerance(x: float, tolerance: float) -> float:
+    """Half-width at which a bracket around x counts as converged."""
+    return 2 * _EPS * abs(x) + 0.5 * tolerance
+
+
+# Interpolation steps run free while a bracket is no wider than bisection
+# alone would have left it after (iteration - _BISECTION_SLACK) steps;
+# beyond that budget every step bisects. Root finders therefore never need
+# more than about _BISECTION_SLACK iterations beyond plain bisection, even on
+# multiple roots where interpolation converges only linearly, while smooth
+# problems (which converge well inside the budget) are unaffected.
+_BISECTION_SLACK = 8
+
+
+def _bisection_budget(initial_width: float, iteration: int) -> float:
+    return initial_width * 2.0 ** (_BISECTION_SLACK - iteration)
+
+
+# Iterations without halving the bracket after which an Illinois lane bisects
+_ILLINOIS_MAX_STALL = 4
+
+
+def _brent_root(func, a: float, b: float, tolerance: float, max_iterations: int):
+    """
+    Brent's method (inverse quadratic interpolation, secant and bisection)
+    on a sign-changing bracket [a, b], bisecting whenever the bracket is
+    wider than _bisection_budget allows.
+    Returns (root, iterations, bracket_width, converged).
+    """
+    fa, fb = func(a), func(b)
+    if fa == 0:
+        return a, 0, 0.0, True
+    if fb == 0:
+        return b, 0, 0.0, True
+    if (fa > 0) == (fb > 0):
+        raise ValueError("f(a) and f(b) must have opposite signs")
+    
+    c, fc = a, fa
+    d = e = b - a
+    initial_width = abs(b - a)
+    for iteration in range(max_iterations + 1):
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        
+        tol = _bracket_tolerance(b, tolerance)
+        half = (c - b) / 2
+        if abs(half) <= tol or fb == 0:
+            return b, iteration, abs(c - b), True
+        if iteration == max_iterations:
+            break
+        
+        over_budget = abs(c - b) > _bisection_budget(initial_width, iteration)
+        if not over_budget and abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                # Secant step
+                p = 2 * half * s
+                q = 1 - s
+            else:
+                # Inverse quadratic interpolation
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * half * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * half * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = half
+        else:
+            d = e = half
+        
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, half)
+        fb = func(b)
+    return b, max_iterations, abs(c - b), False
+
+
+def _illinois_lanes(func, lower, upper, args, tolerance: float, max_iterations: int):
+    """
+    Lockstep Illinois (modified regula falsi) over many brackets. Each
+    iteration makes one call func(xs, *args) for the lanes still running,
+    so converged lanes stop costing evaluations. A lane bisects instead of
+    interpolating when its bracket has not halved for _ILLINOIS_MAX_STALL
+    iterations (badly scaled brackets) or is wider than _bisection_budget
+    allows (multiple roots).
+    Returns (roots, iterations, widths, converged) as lists.
+    """
+    n = len(lower)
+    a, b = [float(v) for v in lower], [float(v) for v in upper]
+    fa = list(func(a, *args))
+    fb = list(func(b, *args))
+    roots, iterations = [math.nan] * n, [0] * n
+    widths, converged = [abs(hi - lo) for lo, hi in zip(a, b)], [False] * n
+    side, stall = [0] * n, [0] * n
+    initial_widths = list(widths)
+    checkpoint = list(widths)  # bracket width when it last halved
+    
+    active = []
+    for i in range(n):
+        if fa[i] == 0 or fb[i] == 0:
+            roots[i] = a[i] if fa[i] == 0 else b[i]
+            converged[i] = True
+        elif (fa[i] > 0) != (fb[i] > 0):
+            active.append(i)
+    
+    for iteration in range(1, max_iterations + 1):
+        if not active:
+            break
+        xs = [(a[i] + b[i]) / 2 if (stall[i] >= _ILLINOIS_MAX_STALL or
+                                    widths[i] > _bisection_budget(initial_widths[i], iteration)) else
+              (a[i] * fb[i] - b[i] * fa[i]) / (fb[i] - fa[i]) for i in active]
+        lane_args = [[arg[i] for i in active] for arg in args]
+        fxs = list(func(xs, *lane_args))
+        still_active = []
+        for i, x, fx in zip(active, xs, fxs):
+            iterations[i] = iteration
+            if fx == 0:
+                roots[i], widths[i], converged[i] = x, 0.0, True
+                continue
+            new_side = -1 if (fx > 0) == (fb[i] > 0) else 1
+            if new_side == -1:
+                b[i], fb[i] = x, fx
+                if side[i] == -1:
+                    fa[i] /= 2  # the a end was kept twice: halve its weight
+            else:
+                a[i], fa[i] = x, fx
+                if side[i] == 1:
+                    fb[i] /= 2
+            side[i] = new_side
+            widths[i] = abs(b[i] - a[i])
+            if widths[i] <= checkpoint[i] / 2:
+                checkpoint[i], stall[i] = widths[i], 0
+            else:
+                stall[i] += 1
+            roots[i] = x
+            if widths[i] <= 2 * _bracket_tolerance(x, tolerance):
+                converged[i] = True
+            else:
+                still_active.append(i)
+        active = still_active
+    return roots, iterations, widths, converged
+
+
+def _illinois_lanes_numpy(func, lower, upper, args, tolerance: float, max_iterations: int):
+    """NumPy version of _illinois_lanes; func receives and returns ndarrays."""
+    a, b = np.broadcast_arrays(np.asarray(lower, dtype=float), np.asarray(upper, dtype=float))
+    a, b = a.astype(float).ravel(), b.astype(float).ravel()
+    args = [np.broadcast_to(np.asarray(arg), a.shape) for arg in args]
+    fa = np.asarray(func(a, *args), dtype=float)
+    fb = np.asarray(func(b, *args), dtype=float)
+    n = a.size
+    roots = np.where(fa == 0, a, np.where(fb == 0, b, np.nan))
+    converged = (fa == 0) | (fb == 0)
+    iterations = np.zeros(n, dtype=np.int64)
+    widths = np.abs(b - a)
+    side = np.zeros(n, dtype=np.int8)
+    stall = np.zeros(n, dtype=np.int64)
+    initial_widths = widths.copy()
+    checkpoint = widths.copy()
+    active = np.flatnonzero(~converged & (np.sign(fa) != np.sign(fb)))
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for iteration in range(1, max_iterations + 1):
+            if active.size == 0:
+                break
+            ai, bi, fai, fbi = a[active], b[active], fa[active], fb[active]
+            bisecting = ((stall[active] >= _ILLINOIS_MAX_STALL) |
+                         (widths[active] > _bisection_budget(initial_widths[active], iteration)))
+            x = np.where(bisecting, (ai + bi) / 2, (ai * fbi - bi * fai) / (fbi - fai))
+            fx = np.asarray(func(x, *(arg[active] for arg in args)), dtype=float)
+            iterations[active] = iteration
+            
+            keep_a = np.sign(fx) == np.sign(fbi)
+            exact = fx == 0
+            # Illinois: halve the weight of an end that is kept twice in a row
+            fai = np.where(keep_a & (side[active] == -1), fai / 2, fai)
+            fbi = np.where(~keep_a & (side[active] == 1), fbi / 2, fbi)
+            new_side = np.where(keep_a, -1, 1)
+            b[active] = np.where(keep_a, x, bi)
+            fb[active] = np.where(keep_a, fx, fbi)
+            a[active] = np.where(keep_a, ai, x)
+            fa[active] = np.where(keep_a, fai, fx)
+            side[active] = new_side
+            
+            width = np.where(exact, 0.0, np.abs(b[active] - a[active]))
+            widths[active] = width
+            halved = width <= checkpoint[active] / 2
+            checkpoint[active] = np.where(halved, width, checkpoint[active])
+            stall[active] = np.where(halved, 0, stall[active] + 1)
+            roots[active] = x
+            done = exact | (width <= 2 * (2 * _EPS * np.abs(x) + 0.5 * tolerance))
+            converged[active] = done
+            active = active[~done]
+    return roots, iterations, widths, converged
+
+
+class MomentAccumulator:
+    """
+    Single-pass accumulator for count, mean and central moments M2..M4.
+    Each chunk is reduced on its own and folded in with the pairwise update
+    formulas of Chan et al. / Pébay, so states from separate workers or file
+    shards merge exactly as if the data had been seen in one stream.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+    
+    def update(self, chunk) -> 'MomentAccumulator':
+        """Fold a chunk (buffer, array or iterable of numbers) into the state."""
+        if np is not None and isinstance(chunk, np.ndarray):
+            values = chunk.astype(float, copy=False).ravel()
+            n = values.size
+            if n == 0:
+                return self
+            mean = float(values.mean())
+            d = values - mean
+            d2 = d * d
+            part = MomentAccumulator._from_moments(
+                n, mean, float(d2.sum()), float((d2 * d).sum()), float((d2 * d2).sum()))
+            return self.merge(part)
+        
+        values = _as_float_array(chunk)
+        n = len(values)
+        if n == 0:
+            return self
+        mean = math.fsum(values) / n
+        d2 = [(x - mean) ** 2 for x in values]
+        m3 = math.fsum((x - mean) * sq for x, sq in zip(values, d2))
+        m4 = math.fsum(sq * sq for sq in d2)
+        return self.merge(MomentAccumulator._from_moments(n, mean, math.fsum(d2), m3, m4))
+    
+    def merge(self, other: 'MomentAccumulator') -> 'MomentAccumulator':
+        """Combine another accumulator's state into this one in place."""
+        na, nb = self.count, other.count
+        if nb == 0:
+            return self
+        if na == 0:
+            self.count, self.mean = other.count, other.mean
+            self.m2, self.m3, self.m4 = other.m2, other.m3, other.m4
+            return self
+        
+        n = na + nb
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term = delta * delta_n * na * nb
+        
+        m4 = (self.m4 + other.m4
+              + term * delta_n2 * (na * na - na * nb + nb * nb)
+              + 6 * delta_n2 * (na * na * other.m2 + nb * nb * self.m2)
+              + 4 * delta_n * (na * other.m3 - nb * self.m3))
+        m3 = (self.m3 + other.m3
+              + term * delta_n * (na - nb)
+              + 3 * delta_n * (na * other.m2 - nb * self.m2))
+        m2 = self.m2 + other.m2 + term
+        
+        self.count = n
+        self.mean += delta_n * nb
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        return self
+    
+    @classmethod
+    def _from_moments(cls, count: int, mean: float, m2: float, m3: float, m4: float):
+        acc = cls()
+        acc.count, acc.mean, acc.m2, acc.m3, acc.m4 = count, mean, m2, m3, m4
+        return acc
+    
+    def to_dict(self) -> Dict:
+        """Serializable state, e.g. for shipping partial results between processes."""
+        return {'count': self.count, 'mean': self.mean,
+                'm2': self.m2, 'm3': self.m3, 'm4': self.m4}
+    
+    @classmethod
+    def from_dict(cls, state: Dict) -> 'MomentAccumulator':
+        return cls._from_moments(state['count'], state['mean'],
+                                 state['m2'], state['m3'], state['m4'])
+    
+    def variance(self) -> float:
+        """Population variance (divides by n, like standard_deviation)."""
+        return self.m2 / self.count
+    
+    def standard_deviation(self) -> float:
+        return math.sqrt(self.variance())
+    
+    def skewness(self) -> float:
+        return math.sqrt(self.count) * self.m3 / self.m2 ** 1.5
+    
+    def kurtosis(self) -> float:
+        """Excess kurtosis, matching calculate_kurtosis."""
+        return self.count * self.m4 / (self.m2 * self.m2) - 3
+
+
+def _select_order_statistics(values, ranks: List[int]) -> Dict[int, float]:
+    """
+    Return {rank: value} for 0-based ranks. With NumPy, np.partition finds
+    them in expected linear time without a full sort; without it, sorted()
+    runs in C and beats any pure-Python selection, so it is used instead.
+    """
+    if np is not None:
+        partitioned = np.partition(np.asarray(values, dtype=float), sorted(set(ranks)))
+        return {r: float(partitioned[r]) for r in ranks}
+    sorted_values = sorted(values)
+    return {r: sorted_values[r] for r in ranks}
+
+
+def _quartile_summary(q1: float, q2: float, q3: float) -> Dict:
+    """Quartiles plus IQR and Tukey fences."""
+    iqr = q3 - q1
+    return {
+        'Q1': q1,
+        'Q2_median': q2,
+        'Q3': q3,
+        'IQR': iqr,
+        'lower_fence': q1 - 1.5*iqr,
+        'upper_fence': q3 + 1.5*iqr
+    }
+
+
+class QuantileSketch:
+    """
+    Bounded-memory, mergeable quantile sketch (KLL compactor hierarchy).
+    
+    Memory is O(k) items regardless of stream length. With high
+    probability (about 99%) the rank of a returned quantile is within
+    roughly 1.7/k · n of the requested rank, e.g. ±0.85% of n for the
+    default k = 200. Sketches built on separate shards can be merged and
+    keep the same guarantee.
+    """
+    
+    def __init__(self, k: int = 200, seed: int = None):
+        if k < 8:
+            raise ValueError("Sketch parameter k must be at least 8")
+        self.k = k
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.compactors = [[]]
+        self._rng = random.Random(seed)
+    
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+    
+    def _size(self) -> int:
+        return sum(len(c) for c in self.compactors)
+    
+    def _max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self.compactors)))
+    
+    def _compress(self):
+        while self._size() >= self._max_size():
+            for h, compactor in enumerate(self.compactors):
+                if len(compactor) >= self._capacity(h):
+                    if h + 1 == len(self.compactors):
+                        self.compactors.append([])
+                    compactor.sort()
+                    # Keep the odd one out at this level so weights stay exact
+                    leftover = [compactor.pop()] if len(compactor) % 2 else []
+                    offset = self._rng.getrandbits(1)
+                    self.compactors[h + 1].extend(compactor[offset::2])
+                    self.compactors[h] = leftover
+                    break
+    
+    def update(self, chunk) -> 'QuantileSketch':
+        """Add a chunk (buffer, array or iterable of numbers) to the sketch."""
+        values = _as_float_array(chunk)
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+        level0 = self.compactors[0]
+        step = self._capacity(0)
+        for start in range(0, len(values), step):
+            level0.extend(values[start:start + step])
+            if len(level0) >= step:
+                self._compress()
+                level0 = self.compactors[0]
+        return self
+    
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Combine another sketch (same k) into this one in place."""
+        if other.k != self.k:
+            raise ValueError("Cannot merge sketches with different k")
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for h, compactor in enumerate(other.compactors):
+            self.compactors[h].extend(compactor)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+    
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile, 0 ≤ q ≤ 1."""
+        if self.count == 0:
+            raise ValueError("Sketch is empty")
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be in [0, 1]")
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        weighted = sorted((x, 1 << h) for h, c in enumerate(self.compactors) for x in c)
+        target = q * sum(w for _, w in weighted)
+        cumulative = 0
+        for x, w in weighted:
+            cumulative += w
+            if cumulative >= target:
+                return x
+        return self.max
+
+
+class SparseMatrix:
+    """
+    Compressed sparse row (CSR) matrix.
+    Storage and the cost of products, transposes and matrix-vector
+    multiplies scale with the number of nonzeros, not rows × cols.
+    """
+    
+    def __init__(self, rows: int, cols: int, indptr: array, indices: array, data: array):
+        self.rows = rows
+        self.cols = cols
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+    
+    @classmethod
+    def from_triplets(cls, rows: int, cols: int, triplets) -> 'SparseMatrix':
+        """Build from (row, col, value) triplets; duplicate entries are summed."""
+        entries = {}
+        for i, j, v in triplets:
+            if not (0 <= i < rows and 0 <= j < cols):
+                raise ValueError(f"Entry ({i}, {j}) is outside a {rows}x{cols} matrix")
+            entries[i, j] = entries.get((i, j), 0.0) + v
+        
+        indptr = array('q', [0] * (rows + 1))
+        indices = array('q')
+        data = array('d')
+        for (i, j), v in sorted(entries.items()):
+            if v != 0:
+                indptr[i + 1] += 1
+                indices.append(j)
+                data.append(v)
+        for i in range(rows):
+            indptr[i + 1] += indptr[i]
+        return cls(rows, cols, indptr, indices, data)
+    
+    @classmethod
+    def from_dense(cls, matrix: List[List[float]]) -> 'SparseMatrix':
+        rows = len(matrix)
+        cols = len(matrix[0]) if rows else 0
+        return cls.from_triplets(rows, cols, ((i, j, v) for i, row in enumerate(matrix)
+                                              for j, v in enumerate(row) if v != 0))
+    
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+    
+    def to_dense(self) -> List[List[float]]:
+        dense = [[0.0] * self.cols for _ in range(self.rows)]
+        for i in range(self.rows):
+            row = dense[i]
+            for k in range(self.indptr[i], self.indptr[i + 1]):
+                row[self.indices[k]] = self.data[k]
+        return dense
+    
+    def transpose(self) -> 'SparseMatrix':
+        """Transpose by counting sort over column indices, O(nnz + cols)."""
+        counts = array('q', [0] * (self.cols + 1))
+        for j in self.indices:
+            counts[j + 1] += 1
+        for j in range(self.cols):
+            counts[j + 1] += counts[j]
+        
+        next_slot = counts[:-1]
+        indices = array('q', bytes(8 * self.nnz))
+        data = array('d', bytes(8 * self.nnz))
+        for i in range(self.rows):
+            for k in range(self.indptr[i], self.indptr[i + 1]):
+                j = self.indices[k]
+                slot = next_slot[j]
+                indices[slot] = i
+                data[slot] = self.data[k]
+                next_slot[j] = slot + 1
+        return SparseMatrix(self.cols, self.rows, counts, indices, data)
+    
+    @property
+    def T(self) -> 'SparseMatrix':
+        return self.transpose()
+    
+    def matvec(self, vector: List[float]) -> List[float]:
+        """Sparse matrix × dense vector."""
+        if len(vector) != self.cols:
+            raise ValueError(f"Cannot multiply {self.rows}x{self.cols} by vector of length {len(vector)}")
+        indptr, indices, data = self.indptr, self.indices, self.data
+        return [sum(data[k] * vector[indices[k]] for k in range(indptr[i], indptr[i + 1]))
+                for i in range(self.rows)]
+    
+    def multiply_dense(self, matrix: List[List[float]]) -> List[List[float]]:
+        """Sparse matrix × dense nested-list matrix."""
+        if len(matrix) != self.cols:
+            raise ValueError(f"Cannot multiply {self.rows}x{self.cols} by "
+                             f"{len(matrix)}x{len(matrix[0]) if matrix else 0}")
+        width = len(matrix[0]) if matrix else 0
+        result = []
+        for i in range(self.rows):
+            acc = [0.0] * width
+            for k in range(self.indptr[i], self.indptr[i + 1]):
+                a = self.data[k]
+                acc = [c + a * b for c, b in zip(acc, matrix[self.indices[k]])]
+            result.append(acc)
+        return result
+    
+    def multiply_sparse(self, other: 'SparseMatrix') -> 'SparseMatrix':
+        """Sparse × sparse product (Gustavson's row-by-row algorithm)."""
+        if self.cols != other.rows:
+            raise ValueError(f"Cannot multiply {self.rows}x{self.cols} by {other.rows}x{other.cols}")
+        indptr = array('q', [0])
+        indices = array('q')
+        data = array('d')
+        for i in range(self.rows):
+            row = {}
+            for k in range(self.indptr[i], self.indptr[i + 1]):
+                a = self.data[k]
+                r = self.indices[k]
+                for kk in range(other.indptr[r], other.indptr[r + 1]):
+                    j = other.indices[kk]
+                    row[j] = row.get(j, 0.0) + a * other.data[kk]
+            for j in sorted(row):
+                if row[j] != 0:
+                    indices.append(j)
+                    data.append(row[j])
+            indptr.append(len(data))
+        return SparseMatrix(self.rows, other.cols, indptr, indices, data)
+    
+    def __matmul__(self, other):
+        if isinstance(other, SparseMatrix):
+            return self.multiply_sparse(other)
+        if np is not None and isinstance(other, np.ndarray):
+            other = other.tolist()
+        if len(other) > 0 and isinstance(other[0], (list, tuple, array)):
+            return self.multiply_dense(other)
+        return self.matvec(other)
+
+
+def _linear_operator(matrix):
+    """Matrix-vector product function for a SparseMatrix or dense nested list."""
+    if isinstance(matrix, SparseMatrix):
+        if matrix.rows != matrix.cols:
+            raise ValueError("Iterative solvers require a square matrix")
+        return matrix.rows, matrix.matvec
+    n = len(matrix)
+    if any(len(row) != n for row in matrix):
+        raise ValueError("Iterative solvers require a square matrix")
+    return n, lambda v: [sum(map(operator.mul, row, v)) for row in matrix]
+
+
+def _check_system_vectors(n: int, constants, initial_guess=None):
+    """Right-hand side and starting point must match the matrix size (zip would truncate)."""
+    if len(constants) != n:
+        raise ValueError(f"Expected {n} constants, got {len(constants)}")
+    if initial_guess is not None and len(initial_guess) != n:
+        raise ValueError(f"Expected an initial guess of length {n}, got {len(initial_guess)}")
+
+
+def _dot(u: List[float], v: List[float]) -> float:
+    return sum(map(operator.mul, u, v))
+
+
+def _complex_values(real, imag=None):
+    """
+    Complex array from parallel real/imag arrays, or from one array of
+    complex numbers when imag is None. NumPy complex128 when available.
+    """
+    if np is not None:
+        if imag is None:
+            return np.asarray(real, dtype=complex)
+        return np.asarray(real, dtype=float) + 1j * np.asarray(imag, dtype=float)
+    if imag is None:
+        return [complex(z) for z in real]
+    real, imag = _numeric_view(real), _numeric_view(imag)
+    if len(real) != len(imag):
+        raise ValueError("Real and imaginary arrays must have the same length")
+    return [complex(r, i) for r, i in zip(real, imag)]
+
+
+def _store(out, values):
+    """Write values into a caller-provided buffer, or return a new array."""
+    if np is not None:
+        values = np.asarray(values, dtype=float)
+        if out is None:
+            return values
+        np.asarray(out)[...] = values  # memoryview/array.array outputs share memory
+        return out
+    values = values if isinstance(values, array) else array('d', values)
+    if out is None:
+        return values
+    if len(out) != len(values):
+        raise ValueError("Output buffer has the wrong length")
+    out[:] = values
+    return out
+
+
+def _split_complex(values, out=None):
+    """Split complex values into (real, imag) arrays, filling out=(re, im) if given."""
+    out_real, out_imag = out if out is not None else (None, None)
+    if np is not None:
+        values = np.asarray(values)
+        return _store(out_real, values.real), _store(out_imag, values.imag)
+    return (_store(out_real, [z.real for z in values]),
+            _store(out_imag, [z.imag for z in values]))
+
+
+def _fft_radix2(values: List[complex], inverse: bool) -> List[complex]:
+    """Iterative in-place radix-2 Cooley–Tukey FFT; len(values) must be a power of 2."""
+    n = len(values)
+    a = list(values)
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            a[i], a[j] = a[j], a[i]
+    
+    sign = 1 if inverse else -1
+    size = 2
+    while size <= n:
+        half = size // 2
+        step = cmath.exp(sign * 2j * math.pi / size)
+        twiddles = [step ** k for k in range(half)]
+        for start in range(0, n, size):
+            for k in range(half):
+                even = a[start + k]
+                odd = a[start + k + half] * twiddles[k]
+                a[start + k] = even + odd
+                a[start + k + half] = even - odd
+        size *= 2
+    return a
+
+
+def _fft(values: List[complex], inverse: bool = False) -> List[complex]:
+    """Unnormalized DFT of any length (Bluestein's chirp-z for non-powers of 2)."""
+    n = len(values)
+    if n == 0:
+        return []
+    if n & (n - 1) == 0:
+        return _fft_radix2(values, inverse)
+    
+    sign = 1 if inverse else -1
+    # Chirp w_k = exp(sign·iπk²/n); k² is reduced mod 2n to keep the angle small
+    chirp = [cmath.exp(sign * 1j * math.pi * (k * k % (2 * n)) / n) for k in range(n)]
+    m = 1 << (2 * n - 1).bit_length()
+    a = [v * c for v, c in zip(values, chirp)] + [0j] * (m - n)
+    b = [0j] * m
+    b[0] = 1
+    for k in range(1, n):
+        b[k] = b[m - k] = chirp[k].conjugate()
+    fa = _fft_radix2(a, False)
+    fb = _fft_radix2(b, False)
+    conv = _fft_radix2([x * y for x, y in zip(fa, fb)], True)
+    return [conv[k] / m * chirp[k] for k in range(n)]
+
+
+def _vector_rows(vectors):
+    """Rows of an N×D input (nested lists, FlatMatrix or ndarray) as sequences."""
+    if np is not None:
+        rows = np.asarray(vectors.to_rows() if isinstance(vectors, FlatMatrix) else vectors,
+                          dtype=float)
+        if rows.ndim != 2:
+            raise ValueError("Expected a 2-D array of vectors")
+        return rows
+    if isinstance(vectors, FlatMatrix):
+        return [vectors.row(i) for i in range(vectors.rows)]
+    return [_numeric_view(v) for v in vectors]
+
+
+def _similarity_block(queries, query_norms, corpus, corpus_norms, metric: str, mode: str):
+    """Score one block of queries against one block of corpus vectors."""
+    if np is not None:
+        scores = queries @ corpus.T
+        if metric == 'dot':
+            return scores
+        cosines = np.clip(scores / np.outer(query_norms, corpus_norms), -1.0, 1.0)
+        if metric == 'cosine':
+            return cosines
+        angles = np.arccos(cosines)
+        return np.degrees(angles) if mode == 'deg' else angles
+    
+    block = []
+    for q, q_norm in zip(queries, query_norms):
+        scores = [sum(map(operator.mul, q, v)) for v in corpus]
+        if metric != 'dot':
+            scores = [max(-1.0, min(1.0, d / (q_norm * v_norm)))
+                      for d, v_norm in zip(scores, corpus_norms)]
+            if metric == 'angle':
+                scores = [math.acos(x) for x in scores]
+                if mode == 'deg':
+                    scores = [math.degrees(x) for x in scores]
+        block.append(scores)
+    return block
+
+
+def _vector_norms(rows):
+    if np is not None:
+        return np.sqrt(np.einsum('ij,ij->i', rows, rows))
+    return [math.sqrt(sum(map(operator.mul, v, v))) for v in rows]
+
+
+def _check_similarity_inputs(queries, corpus, query_norms, corpus_norms, metric: str):
+    if metric not in ('dot', 'cosine', 'angle'):
+        raise ValueError(f"Unknown similarity metric: {metric}")
+    if len(queries) and len(corpus) and len(queries[0]) != len(corpus[0]):
+        raise ValueError("Vectors must have same dimension")
+    if metric != 'dot' and (any(n == 0 for n in query_norms) or any(n == 0 for n in corpus_norms)):
+        raise ValueError("Cannot calculate angle with zero-magnitude vector")
+
+
+def solution_tuple(result: Dict) -> Tuple:
+    """
+    The solutions of any solver result as a tuple, whatever its layout
+    ('solution', 'solutions' list or x/y/z dict, 'x' and 'y'); empty when
+    there is no unique solution.
+    """
+    if 'solution' in result:
+        return (result['solution'],)
+    if 'x' in result:
+        return (result['x'], result['y'])
+    solutions = result.get('solutions', ())
+    return tuple(solutions.values() if isinstance(solutions, dict) else solutions)
+
+
+# Root-type codes reported by solve_quadratic_batch
+ROOTS_INVALID = 0
+ROOTS_LINEAR = 1
+ROOTS_REAL_DISTINCT = 2
+ROOTS_REAL_REPEATED = 3
+ROOTS_COMPLEX = 4
+
+ROOT_TYPE_NAMES = {
+    ROOTS_INVALID: 'invalid',
+    ROOTS_LINEAR: 'linear',
+    ROOTS_REAL_DISTINCT: 'real_distinct',
+    ROOTS_REAL_REPEATED: 'real_repeated',
+    ROOTS_COMPLEX: 'complex',
+}
+
+
+class QuadraticRoots:
+    """
+    Batch quadratic roots as parallel arrays. root1 is the '+' root and
+    root2 the '−' root of (−b ± √disc) / 2a; unused slots are NaN.
+    codes holds one ROOTS_* value per equation.
+    """
+    __slots__ = ('root1_real', 'root1_imag', 'root2_real', 'root2_imag', 'codes')
+    
+    def __init__(self, root1_real, root1_imag, root2_real, root2_imag, codes):
+        self.root1_real = root1_real
+        self.root1_imag = root1_imag
+        self.root2_real = root2_real
+        self.root2_imag = root2_imag
+        self.codes = codes
+    
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __len__(self) -> int:
+        return len(self.codes)
+    
+    def to_dict(self) -> Dict:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+def _stable_real_roots(a: float, b: float, c: float, sqrt_disc: float):
+    """
+    Real roots without cancellation: q = −(b + sign(b)·√disc)/2, roots q/a
+    and c/q. Returned as ('+' root, '−' root) to match (−b ± √disc)/2a.
+    """
+    q = -(b + math.copysign(sqrt_disc, b)) / 2
+    if q == 0:
+        return 0.0, 0.0
+    big, small = q / a, c / q
+    return (small, big) if b >= 0 else (big, small)
+
+
+class CubicRoots:
+    """
+    Batch cubic roots as parallel arrays. With real_count 3 the roots are
+    root1 ≤ root2 ≤ root3; with real_count 1, root1 is the real root and
+    root2 ± i·imag is the complex pair (root3 == root2). Equations with
+    a == 0 fall back to the quadratic/linear case (real_count 2, 1 or 0,
+    unused slots NaN).
+    """
+    __slots__ = ('root1', 'root2', 'root3', 'imag', 'real_count')
+    
+    def __init__(self, root1, root2, root3, imag, real_count):
+        self.root1 = root1
+        self.root2 = root2
+        self.root3 = root3
+        self.imag = imag
+        self.real_count = real_count
+    
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __len__(self) -> int:
+        return len(self.real_count)
+    
+    def to_dict(self) -> Dict:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+def _real_cbrt(x: float) -> float:
+    return math.copysign(abs(x) ** (1.0 / 3.0), x)
+
+
+def _newton_polish_cubic(a: float, b: float, c: float, d: float, x: float) -> float:
+    """One Newton step on ax³ + bx² + cx + d, kept only if it lowers |f|."""
+    f = ((a * x + b) * x + c) * x + d
+    df = (3 * a * x + 2 * b) * x + c
+    if df == 0 or f == 0:
+        return x
+    y = x - f / df
+    return y if abs(((a * y + b) * y + c) * y + d) <= abs(f) else x
+
+
+def _cubic_roots(a: float, b: float, c: float, d: float):
+    """
+    Roots of ax³ + bx² + cx + d (a ≠ 0) as (r1, r2, r3, imag, real_count).
+    Three real roots use the trigonometric form; otherwise Cardano with
+    real cube roots, with the larger term formed first to avoid cancellation.
+    """
+    B, C, D = b / a, c / a, d / a
+    shift = B / 3
+    p = C - B * shift
+    q = (2 * B * B / 27 - C / 3) * B + D
+    half_q = q / 2
+    delta = half_q * half_q + (p / 3) ** 3
+    if abs(delta) <= 512 * _EPS * (half_q * half_q + abs(p / 3) ** 3):
+        # Within rounding of zero: treat as a repeated root rather than a split pair
+        delta = 0.0
+    
+    if delta < 0:
+        # Three distinct real roots: t_k = 2√(−p/3)·cos(φ/3 − 2πk/3)
+        m = 2 * math.sqrt(-p / 3)
+        phi = math.acos(max(-1.0, min(1.0, 3 * q / (p * m))))
+        roots = sorted(_newton_polish_cubic(a, b, c, d, m * math.cos((phi - 2 * math.pi * k) / 3) - shift)
+                       for k in range(3))
+        return roots[0], roots[1], roots[2], 0.0, 3
+    
+    w = -half_q - math.copysign(math.sqrt(delta), half_q)
+    u = _real_cbrt(w)
+    v = -p / (3 * u) if u != 0 else 0.0
+    real_root = _newton_polish_cubic(a, b, c, d, u + v - shift)
+    pair_real = -(u + v) / 2 - shift
+    imag = abs(math.sqrt(3) / 2 * (u - v))
+    if delta == 0 or imag == 0:
+        pair_real = _newton_polish_cubic(a, b, c, d, pair_real)
+        roots = sorted((real_root, pair_real, pair_real))
+        return roots[0], roots[1], roots[2], 0.0, 3
+    return real_root, pair_real, pair_real, imag, 1
+
+
+_EXPRESSION_FUNCTIONS = {
+    'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
+    'asin': math.asin, 'acos': math.acos, 'atan': math.atan, 'atan2': math.atan2,
+    'sinh': math.sinh, 'cosh': math.cosh, 'tanh': math.tanh,
+    'sqrt': math.sqrt, 'exp': math.exp, 'log': math.log, 'ln': math.log,
+    'log10': math.log10, 'abs': abs, 'floor': math.floor, 'ceil': math.ceil,
+    'gamma': math.gamma, 'erf': math.erf, 'min': min, 'max': max,
+    'pi': math.pi, 'e': math.e, 'tau': math.tau,
+}
+
+if np is not None:
+    _EXPRESSION_ARRAY_FUNCTIONS = {
+        'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+        'asin': np.arcsin, 'acos': np.arccos, 'atan': np.arctan, 'atan2': np.arctan2,
+        'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+        'sqrt': np.sqrt, 'exp': np.exp, 'ln': np.log, 'log10': np.log10,
+        'log': lambda x, base=None: np.log(x) if base is None else np.log(x) / np.log(base),
+        'abs': np.abs, 'floor': np.floor, 'ceil': np.ceil,
+        'gamma': np.vectorize(math.gamma), 'erf': np.vectorize(math.erf),
+        # Reduce pairwise: a third positional argument to np.minimum is its out array
+        'min': lambda *args: functools.reduce(np.minimum, args),
+        'max': lambda *args: functools.reduce(np.maximum, args),
+        'pi': math.pi, 'e': math.e, 'tau': math.tau,
+    }
+
+
+
+def _check_variable_names(variables) -> None:
+    """Variables may not shadow the functions and constants expressions can call."""
+    if variables and not _EXPRESSION_FUNCTIONS.keys().isdisjoint(variables):
+        clashes = sorted(_EXPRESSION_FUNCTIONS.keys() & set(variables))
+        raise ValueError(f"Variable name(s) clash with built-in names: {', '.join(clashes)}")
+
+
+_EXPRESSION_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.UAdd, ast.USub,
+)
+
+
+class CompiledExpression:
+    """
+    A formula parsed and validated once, then evaluated many times.
+    Only arithmetic, numeric literals, variables and the functions in
+    _EXPRESSION_FUNCTIONS are allowed; '^' means exponentiation.
+    """
+    
+    def __init__(self, source: str):
+        self.source = source
+        tree = ast.parse(source.replace('^', '**').strip(), mode='eval')
+        names = set()
+        for node in ast.walk(tree):
+            if not isinstance(node, _EXPRESSION_NODES):
+                raise ValueError(f"Unsupported element in expression: {type(node).__name__}")
+            if isinstance(node, ast.Constant):
+                if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                    raise ValueError(f"Unsupported literal in expression: {node.value!r}")
+                # Float literals keep huge powers like 9^9^9 from building big integers
+                node.value = float(node.value)
+            if isinstance(node, ast.Call):
+                if (not isinstance(node.func, ast.Name) or node.keywords
+                        or not callable(_EXPRESSION_FUNCTIONS.get(node.func.id))):
+                    raise ValueError("Only calls to built-in math functions are allowed")
+            if isinstance(node, ast.Name):
+                if node.id.startswith('_'):
+                    raise ValueError(f"Invalid name in expression: {node.id}")
+                if node.id not in _EXPRESSION_FUNCTIONS:
+                    names.add(node.id)
+        self.variables = frozenset(names)
+        self._code = compile(tree, '<expression>', 'eval')
+        self._globals = {'__builtins__': {}, **_EXPRESSION_FUNCTIONS}
+    
+    def evaluate(self, variables: Dict = None) -> float:
+        """Evaluate with scalar variable values."""
+        _check_variable_names(variables)
+        missing = self.variables.difference(variables or ())
+        if missing:
+            raise NameError(f"Undefined variable(s): {', '.join(sorted(missing))}")
+        return eval(self._code, self._globals, variables or {})
+    
+    def evaluate_batch(self, columns: Dict):
+        """
+        Evaluate over arrays of variable values (one array per variable).
+        Scalars in columns are broadcast. Returns an ndarray when NumPy is
+        available, otherwise array('d').
+        """
+        _check_variable_names(columns)
+        missing = self.variables.difference(columns)
+        if missing:
+            raise NameError(f"Undefined variable(s): {', '.join(sorted(missing))}")
+        
+        if np is not None:
+            env = {name: np.asarray(columns[name], dtype=float) for name in self.variables}
+            array_globals = {'__builtins__': {}, **_EXPRESSION_ARRAY_FUNCTIONS}
+            result = eval(self._code, array_globals, env)
+            shape = np.broadcast_shapes(*(v.shape for v in env.values())) if env else ()
+            return np.broadcast_to(np.asarray(result, dtype=float), shape).copy()
+        
+        arrays = {}
+        scalars = {}
+        for name in self.variables:
+            value = columns[name]
+            if isinstance(value, (int, float)):
+                scalars[name] = value
+            else:
+                arrays[name] = _as_float_array(value)
+        lengths = {len(v) for v in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError("Variable arrays must all have the same length")
+        n = lengths.pop() if lengths else 1
+        
+        names = list(arrays)
+        code, env_globals = self._code, self._globals
+        result = array('d')
+        for row in zip(*(arrays[name] for name in names)) if names else [()] * n:
+            env = dict(scalars)
+            env.update(zip(names, row))
+            result.append(eval(code, env_globals, env))
+        return result
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_expression(source: str) -> CompiledExpression:
+    """LRU cache of compiled expressions keyed by source text."""
+    return CompiledExpression(source)
+
+
+# Factorials up to this n are memoized for repeated small-n queries
+_FACTORIAL_CACHE_LIMIT = 1024
+
+
+@functools.lru_cache(maxsize=_FACTORIAL_CACHE_LIMIT + 1)
+def _cached_factorial(n: int) -> int:
+    return math.factorial(n)
+
+
+_MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def _is_prime(n: int) -> bool:
+    """Miller-Rabin with the first 12 prime bases: exact for n < 3.3e24."""
+    if n < 2:
+        return False
+    for q in _MILLER_RABIN_BASES:
+        if n % q == 0:
+            return n == q
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in _MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _gamma_sign(x: float) -> float:
+    """Sign of Γ(x): negative on (-1, 0), (-3, -2), ..."""
+    return -1.0 if x < 0 and math.floor(x) % 2 else 1.0
+
+
+def _log_abs_beta(x: float, y: float) -> float:
+    """log|B(x, y)| via lgamma, so it never overflows."""
+    lx, ly = math.lgamma(x), math.lgamma(y)  # ValueError at the poles of Γ(x), Γ(y)
+    try:
+        ls = math.lgamma(x + y)
+    except ValueError:
+        return -math.inf  # 1/Γ(x + y) = 0
+    return lx + ly - ls
+
+
+def _beta(x: float, y: float) -> float:
+    if x > 0 and y > 0 and x + y < 171:
+        # Γ(x + y) is finite here; the direct product is exact to a few ulps
+        try:
+            value = math.gamma(x) * math.gamma(y) / math.gamma(x + y)
+        except OverflowError:  # Γ of a subnormal argument
+            value = math.inf
+        if math.isfinite(value):
+            return value
+    log_value = _log_abs_beta(x, y)
+    if log_value == -math.inf:
+        return 0.0
+    return _gamma_sign(x) * _gamma_sign(y) * _gamma_sign(x + y) * math.exp(log_value)
+
+
+# name -> (number of arguments, scalar kernel, value where the kernel raises ValueError)
+_SPECIAL_FUNCTIONS = {
+    'gamma': (1, math.gamma, math.nan),
+    'lgamma': (1, math.lgamma, math.inf),
+    'beta': (2, _beta, math.nan),
+    'log_beta': (2, _log_abs_beta, math.nan),
+    'erf': (1, math.erf, math.nan),
+    'erfc': (1, math.erfc, math.nan),
+}
+
+
+def _total_kernel(kernel, domain_value: float, overflow=None):
+    """
+    Array-safe kernel: poles give domain_value and overflow gives inf (or
+    overflow(*args) for functions whose overflow can be negative).
+    """
+    def safe(*args):
+        try:
+            return kernel(*args)
+        except ValueError:
+            return domain_value
+        except OverflowError:
+            return overflow(*args) if overflow else math.inf
+    return safe
+
+
+# erf on [0, _ERF_TABLE_MAX] sampled every _ERF_TABLE_STEP for the approximate
+# mode. Cubic Hermite interpolation through the exact values and slopes has
+# error ≤ h⁴/384·max|erf⁽⁴⁾| ≈ 6.9e-10, so erf and erfc are within
+# _ERF_TABLE_MAX_ERROR (absolute) everywhere; beyond the table erf is ±1.
+_ERF_TABLE_STEP = 1 / 64
+_ERF_TABLE_MAX = 6.0
+_ERF_TABLE_MAX_ERROR = 1e-9
+
+
+@functools.lru_cache(maxsize=1)
+def _erf_table():
+    count = int(_ERF_TABLE_MAX / _ERF_TABLE_STEP) + 1
+    nodes = [i * _ERF_TABLE_STEP for i in range(count)]
+    values = np.array([math.erf(x) for x in nodes])
+    slopes = np.array([2 / math.sqrt(math.pi) * math.exp(-x * x) for x in nodes])
+    return values, slopes
+
+
+def _erf_approximate(x):
+    """Vectorised table-plus-Hermite erf (NumPy only), absolute error ≤ _ERF_TABLE_MAX_ERROR."""
+    values, slopes = _erf_table()
+    h = _ERF_TABLE_STEP
+    ax = np.abs(x)
+    t = np.where(np.isnan(ax), 0.0, np.minimum(ax, _ERF_TABLE_MAX)) / h
+    i = np.minimum(t.astype(np.intp), len(values) - 2)
+    s = t - i
+    s2, r = s * s, 1 - s
+    result = (values[i] * (1 + 2 * s) * r * r + slopes[i] * h * s * r * r
+              + values[i + 1] * s2 * (3 - 2 * s) - slopes[i + 1] * h * s2 * r)
+    return np.where(np.isnan(x), np.nan, np.copysign(result, x))
+
+
+def _divide(a, b):
+    if b == 0:
+        raise ValueError("Division by zero is undefined")
+    return a / b
+
+
+def _modulo(a, b):
+    if b == 0:
+        raise ValueError("Modulo by zero is undefined")
+    return a % b
+
+
+def _power_overflow(a, b) -> float:
+    return -math.inf if a < 0 and b == int(b) and int(b) % 2 else math.inf
+
+
+def _sinh_overflow(x) -> float:
+    return math.copysign(math.inf, x)
+
+
+# Operation tables: name -> (scalar function, NumPy ufunc name[, angle handling])
+_BASIC_OPERATIONS = {
+    '+': (operator.add, 'add'),
+    '-': (operator.sub, 'subtract'),
+    '*': (operator.mul, 'multiply'),
+    '/': (_divide, 'true_divide'),
+    '^': (operator.pow, 'power'),
+    '%': (_modulo, 'mod'),
+}
+_ZERO_DIVISOR_MESSAGES = {'/': "Division by zero is undefined", '%': "Modulo by zero is undefined"}
+
+# 'input' functions take an angle, 'output' functions return one
+_TRIGONOMETRIC_FUNCTIONS = {
+    'sin': (math.sin, 'sin', 'input'),
+    'cos': (math.cos, 'cos', 'input'),
+    'tan': (math.tan, 'tan', 'input'),
+    'asin': (math.asin, 'arcsin', 'output'),
+    'acos': (math.acos, 'arccos', 'output'),
+    'atan': (math.atan, 'arctan', 'output'),
+}
+
+_HYPERBOLIC_FUNCTIONS = {
+    'sinh': (math.sinh, 'sinh'),
+    'cosh': (math.cosh, 'cosh'),
+    'tanh': (math.tanh, 'tanh'),
+}
+
+# Functions whose overflow in array mode can be -inf map to the value to use
+_OVERFLOW_VALUES = {'^': _power_overflow, 'sinh': _sinh_overflow}
+
+# Array-mode replacements for scalar kernels that do not stay real: (-8) ** 0.5
+# is complex, math.pow raises ValueError instead, which becomes NaN
+_ARRAY_SCALARS = {'^': math.pow}
+
+# Exact types that take the scalar path without an isinstance check
+_SCALAR_TYPES = frozenset((int, float, complex, bool))
+
+
+class BoundKernel:
+    """
+    An operation resolved once (name and angle mode) to its scalar and
+    array implementations. Calling it with numbers runs the scalar
+    function; with any array argument it runs over the whole array
+    (scalars broadcast), where domain errors give NaN instead of raising.
+    """
+    __slots__ = ('name', 'scalar', 'vector', 'zero_divisor_message')
+    
+    def __init__(self, name: str, scalar, vector=None, zero_divisor_message: str = None):
+        self.name = name
+        self.scalar = scalar
+        self.vector = vector
+        self.zero_divisor_message = zero_divisor_message
+    
+    def __call__(self, *args):
+        for arg in args:
+            if type(arg) not in _SCALAR_TYPES and not isinstance(arg, numbers.Number):
+                return self.apply_batch(*args)
+        return self.scalar(*args)
+    
+    def apply_batch(self, *args):
+        """Apply to arrays; returns an ndarray when NumPy is available, otherwise array('d')."""
+        if np is not None:
+            values = [np.asarray(arg, dtype=float) for arg in args]
+            if self.zero_divisor_message and np.any(values[-1] == 0):
+                raise ValueError(self.zero_divisor_message)
+            with np.errstate(invalid='ignore', over='ignore'):
+                return self.vector(*values)
+        
+        columns, length = [], None
+        for arg in args:
+            if isinstance(arg, (int, float)):
+                columns.append(None)
+                continue
+            column = _numeric_view(arg)
+            if length is not None and len(column) != length:
+                raise ValueError("Array arguments must have the same length")
+            length = len(column)
+            columns.append(column)
+        if length is None:
+            length = 1
+        columns = [[arg] * length if column is None else column
+                   for arg, column in zip(args, columns)]
+        if self.zero_divisor_message and any(b == 0 for b in columns[-1]):
+            raise ValueError(self.zero_divisor_message)
+        scalar = _ARRAY_SCALARS.get(self.name, self.scalar)
+        overflow = _OVERFLOW_VALUES.get(self.name)
+        return array('d', map(_total_kernel(scalar, math.nan, overflow), *columns))
+    
+    def __repr__(self) -> str:
+        return f"BoundKernel({self.name!r})"
+
+
+def _ufunc(name: str):
+    return getattr(np, name) if np is not None else None
+
+
+# The same constants math.radians and math.degrees multiply by
+_DEGREES_TO_RADIANS = math.pi / 180
+_RADIANS_TO_DEGREES = 180 / math.pi
+
+
+def _degree_kernel(name: str, function, ufunc, angle: str) -> BoundKernel:
+    """Bind degree conversion into the kernel: the argument of sin/cos/tan, the result of asin/acos/atan."""
+    if angle == 'input':
+        scalar = lambda x, f=function, k=_DEGREES_TO_RADIANS: f(x * k)
+        vector = (lambda x, f=ufunc, k=_DEGREES_TO_RADIANS: f(x * k)) if ufunc else None
+    else:
+        scalar = lambda x, f=function, k=_RADIANS_TO_DEGREES: f(x) * k
+        vector = (lambda x, f=ufunc, k=_RADIANS_TO_DEGREES: f(x) * k) if ufunc else None
+    return BoundKernel(f"{name}[deg]", scalar, vector)
+
+
+# Every kernel is built once at import; lookups are plain dict accesses
+_BASIC_KERNELS = {name: BoundKernel(name, scalar, _ufunc(ufunc), _ZERO_DIVISOR_MESSAGES.get(name))
+                  for name, (scalar, ufunc) in _BASIC_OPERATIONS.items()}
+_TRIGONOMETRIC_KERNELS = {
+    'rad': {name: BoundKernel(name, function, _ufunc(ufunc))
+            for name, (function, ufunc, angle) in _TRIGONOMETRIC_FUNCTIONS.items()},
+    'deg': {name: _degree_kernel(name, function, _ufunc(ufunc), angle)
+            for name, (function, ufunc, angle) in _TRIGONOMETRIC_FUNCTIONS.items()},
+}
+_HYPERBOLIC_KERNELS = {name: BoundKernel(name, function, _ufunc(ufunc))
+                       for name, (function, ufunc) in _HYPERBOLIC_FUNCTIONS.items()}
+
+
+def _resolve_kernel(family: str, name: str, mode: str = 'deg') -> BoundKernel:
+    """Look an operation up in the prebuilt kernel tables."""
+    if family == 'basic':
+        kernels, message = _BASIC_KERNELS, "Unknown operation"
+    elif family == 'trigonometric':
+        if mode not in _TRIGONOMETRIC_KERNELS:
+            raise ValueError(f"Unknown angle mode: {mode}")
+        kernels, message = _TRIGONOMETRIC_KERNELS[mode], "Unknown trigonometric function"
+    elif family == 'hyperbolic':
+        kernels, message = _HYPERBOLIC_KERNELS, "Unknown hyperbolic function"
+    else:
+        raise ValueError(f"Unknown operation family: {family}")
+    kernel = kernels.get(name)
+    if kernel is None:
+        raise ValueError(f"{message}: {name}")
+    return kernel
+
+
 class AdvancedMathCalculator:
     """World-class scientific calculator with equation solving capabilities."""
     
@@ -12,56 +2206,36 @@ class AdvancedMathCalculator:
         self.variables = {}  # Store variable values
     
     def basic_operations(self, num1: float, num2: float, operation: str) -> float:
-        """Perform basic arithmetic operations."""
+        """Perform basic arithmetic operations (element-wise when given arrays)."""
         try:
-            if operation == '+':
-                return num1 + num2
-            elif operation == '-':
-                return num1 - num2
-            elif operation == '*':
-                return num1 * num2
-            elif operation == '/':
-                if num2 == 0:
-                    raise ValueError("Division by zero is undefined")
-                return num1 / num2
-            elif operation == '^':
-                return num1 ** num2
-            elif operation == '%':
-                if num2 == 0:
-                    raise ValueError("Modulo by zero is undefined")
-                return num1 % num2
-            else:
+            kernel = _BASIC_KERNELS.get(operation)
+            if kernel is None:
                 raise ValueError(f"Unknown operation: {operation}")
+            if type(num1) in _SCALAR_TYPES and type(num2) in _SCALAR_TYPES:
+                return kernel.scalar(num1, num2)
+            return kernel(num1, num2)
         except Exception as e:
             self.error_message = str(e)
             return None
     
     def trigonometric(self, value: float, function: str, mode: str = 'deg') -> float:
-        """Calculate trigonometric functions."""
+        """
+        Calculate trigonometric functions (element-wise when given an array).
+        In 'deg' mode sin/cos/tan take degrees and asin/acos/atan return degrees.
+        """
         try:
-            if mode == 'deg':
-                value = math.radians(value)
-            
-            if function == 'sin':
-                return math.sin(value)
-            elif function == 'cos':
-                return math.cos(value)
-            elif function == 'tan':
-                return math.tan(value)
-            elif function == 'asin':
-                if mode == 'deg':
-                    value = math.degrees(value)
-                return math.asin(float(value))
-            elif function == 'acos':
-                if mode == 'deg':
-                    value = math.degrees(value)
-                return math.acos(float(value))
-            elif function == 'atan':
-                if mode == 'deg':
-                    value = math.degrees(value)
-                return math.atan(float(value))
-            else:
+            entry = _TRIGONOMETRIC_FUNCTIONS.get(function)
+            if entry is None:
                 raise ValueError(f"Unknown trigonometric function: {function}")
+            if type(value) not in _SCALAR_TYPES:
+                # Any mode other than 'deg' means radians
+                return _TRIGONOMETRIC_KERNELS['deg' if mode == 'deg' else 'rad'][function](value)
+            scalar, _, angle = entry
+            if mode != 'deg':
+                return scalar(value)
+            if angle == 'input':
+                return scalar(value * _DEGREES_TO_RADIANS)
+            return scalar(value) * _RADIANS_TO_DEGREES
         except ValueError as e:
             self.error_message = f"Domain error: {str(e)}"
             return None
@@ -92,6 +2266,8 @@ class AdvancedMathCalculator:
         try:
             if not isinstance(n, int) or n < 0:
                 raise ValueError("Factorial is only defined for non-negative integers")
+            if n <= _FACTORIAL_CACHE_LIMIT:
+                return _cached_factorial(n)
             return math.factorial(n)
         except Exception as e:
             self.error_message = str(e)
@@ -102,7 +2278,7 @@ class AdvancedMathCalculator:
         try:
             if n < 0 or r < 0 or r > n:
                 raise ValueError("Invalid values for permutation")
-            return math.factorial(n) // math.factorial(n - r)
+            return math.perm(n, r)
         except Exception as e:
             self.error_message = str(e)
             return None
@@ -112,7 +2288,66 @@ class AdvancedMathCalculator:
         try:
             if n < 0 or r < 0 or r > n:
                 raise ValueError("Invalid values for combination")
-            return math.factorial(n) // (math.factorial(r) * math.factorial(n - r))
+            return math.comb(n, r)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def log_factorial(self, n: float) -> Union[float, None]:
+        """Natural log of n! via lgamma, without building the integer."""
+        try:
+            if n < 0:
+                raise ValueError("Factorial is only defined for non-negative numbers")
+            return math.lgamma(n + 1)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def log_permutation(self, n: float, r: float) -> Union[float, None]:
+        """Natural log of P(n,r) via lgamma."""
+        try:
+            if n < 0 or r < 0 or r > n:
+                raise ValueError("Invalid values for permutation")
+            return math.lgamma(n + 1) - math.lgamma(n - r + 1)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def log_comb(self, n: float, r: float) -> Union[float, None]:
+        """Natural log of C(n,r) via lgamma."""
+        try:
+            if n < 0 or r < 0 or r > n:
+                raise ValueError("Invalid values for combination")
+            return math.lgamma(n + 1) - math.lgamma(r + 1) - math.lgamma(n - r + 1)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def comb_mod_p(self, n: int, r: int, p: int) -> Union[int, None]:
+        """
+        Calculate C(n,r) mod p for prime p using Lucas' theorem.
+        Works digit by digit in base p, so n may be astronomically large.
+        """
+        try:
+            if n < 0 or r < 0:
+                raise ValueError("Invalid values for combination")
+            if not _is_prime(p):
+                raise ValueError("Modulus must be a prime")
+            result = 1
+            while r:
+                ni, ri = n % p, r % p
+                if ri > ni:
+                    return 0
+                # C(ni, ri) mod p for single digits; inverse by Fermat's little theorem
+                ri = min(ri, ni - ri)
+                numerator = denominator = 1
+                for i in range(ri):
+                    numerator = numerator * (ni - i) % p
+                    denominator = denominator * (i + 1) % p
+                result = result * numerator * pow(denominator, p - 2, p) % p
+                n //= p
+                r //= p
+            return result % p
         except Exception as e:
             self.error_message = str(e)
             return None
@@ -120,6 +2355,7 @@ class AdvancedMathCalculator:
     def standard_deviation(self, data: list) -> Union[float, None]:
         """Calculate standard deviation."""
         try:
+            data = _numeric_view(data)
             if len(data) < 2:
                 raise ValueError("Need at least 2 data points")
             mean = sum(data) / len(data)
@@ -130,16 +2366,28 @@ class AdvancedMathCalculator:
             return None
     
     def hyperbolic(self, value: float, function: str) -> float:
-        """Calculate hyperbolic functions."""
-        try:
-            if function == 'sinh':
-                return math.sinh(value)
-            elif function == 'cosh':
-                return math.cosh(value)
-            elif function == 'tanh':
-                return math.tanh(value)
-            else:
+        """Calculate hyperbolic functions (element-wise when given an array)."""
+        try:
+            kernel = _HYPERBOLIC_KERNELS.get(function)
+            if kernel is None:
                 raise ValueError(f"Unknown hyperbolic function: {function}")
+            if type(value) in _SCALAR_TYPES:
+                return kernel.scalar(value)
+            return kernel(value)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def resolve_kernel(self, family: str, name: str, mode: str = 'deg') -> Union[BoundKernel, None]:
+        """
+        Resolve an operation once for repeated use, e.g.
+        resolve_kernel('trigonometric', 'sin', 'deg') or resolve_kernel('basic', '/').
+        Families: 'basic', 'trigonometric', 'hyperbolic'; modes: 'deg', 'rad'.
+        The returned BoundKernel accepts numbers or arrays and raises on
+        invalid input; kernel.scalar(x) skips the array check entirely.
+        """
+        try:
+            return _resolve_kernel(family, name, mode)
         except Exception as e:
             self.error_message = str(e)
             return None
@@ -216,30 +2464,95 @@ class AdvancedMathCalculator:
             discriminant = b**2 - 4*a*c
             
             if discriminant > 0:
-                sqrt_disc = math.sqrt(discriminant)
-                x1 = (-b + sqrt_disc) / (2*a)
-                x2 = (-b - sqrt_disc) / (2*a)
+                # _stable_real_roots inlined; q ≠ 0 because discriminant > 0
+                q = -(b + math.copysign(math.sqrt(discriminant), b)) / 2
+                big, small = q / a, c / q
                 return {
                     'type': 'real_distinct',
-                    'solutions': [x1, x2],
+                    'solutions': [small, big] if b >= 0 else [big, small],
                     'discriminant': discriminant
                 }
             elif discriminant == 0:
                 x = -b / (2*a)
-                return {
-                    'type': 'real_repeated',
-                    'solution': x,
-                    'discriminant': 0
-                }
+                return {'type': 'real_repeated', 'solution': x, 'discriminant': 0}
             else:
                 sqrt_disc = cmath.sqrt(discriminant)
                 x1 = (-b + sqrt_disc) / (2*a)
                 x2 = (-b - sqrt_disc) / (2*a)
-                return {
-                    'type': 'complex',
-                    'solutions': [x1, x2],
-                    'discriminant': discriminant
-                }
+                return {'type': 'complex', 'solutions': [x1, x2], 'discriminant': discriminant}
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def solve_quadratic_batch(self, a, b, c) -> QuadraticRoots:
+        """
+        Solve many quadratics a[i]x² + b[i]x + c[i] = 0 at once using the
+        cancellation-free formula. Returns a QuadraticRoots of arrays.
+        """
+        try:
+            if np is not None:
+                a, b, c = (np.asarray(v, dtype=float) for v in (a, b, c))
+                a, b, c = np.broadcast_arrays(a, b, c)
+                disc = b * b - 4 * a * c
+                quadratic = a != 0
+                linear = ~quadratic & (b != 0)
+                codes = np.select(
+                    [linear, quadratic & (disc > 0), quadratic & (disc == 0), quadratic & (disc < 0)],
+                    [ROOTS_LINEAR, ROOTS_REAL_DISTINCT, ROOTS_REAL_REPEATED, ROOTS_COMPLEX],
+                    ROOTS_INVALID).astype(np.int8)
+                
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    sqrt_disc = np.sqrt(np.abs(disc))
+                    q = -(b + np.copysign(sqrt_disc, b)) / 2
+                    big = q / a
+                    small = np.where(q == 0, 0.0, c / q)
+                    plus = np.where(b >= 0, small, big)
+                    minus = np.where(b >= 0, big, small)
+                    center = -b / (2 * a)
+                    spread = sqrt_disc / (2 * a)
+                    
+                    nan = np.full(a.shape, np.nan)
+                    r1_re = np.select([codes == ROOTS_LINEAR, codes == ROOTS_REAL_DISTINCT,
+                                       codes == ROOTS_REAL_REPEATED, codes == ROOTS_COMPLEX],
+                                      [-c / b, plus, center, center], np.nan)
+                    r2_re = np.select([codes == ROOTS_REAL_DISTINCT, codes == ROOTS_REAL_REPEATED,
+                                       codes == ROOTS_COMPLEX], [minus, center, center], np.nan)
+                    r1_im = np.where(codes == ROOTS_COMPLEX, spread,
+                                     np.where(codes == ROOTS_INVALID, nan, 0.0))
+                    r2_im = np.where(codes == ROOTS_COMPLEX, -spread,
+                                     np.where(np.isnan(r2_re), nan, 0.0))
+                return QuadraticRoots(r1_re, r1_im, r2_re, r2_im, codes)
+            
+            a, b, c = _numeric_view(a), _numeric_view(b), _numeric_view(c)
+            if not len(a) == len(b) == len(c):
+                raise ValueError("Coefficient arrays must have the same length")
+            n = len(a)
+            nan = math.nan
+            r1_re, r1_im = array('d', [nan]) * n, array('d', [nan]) * n
+            r2_re, r2_im = array('d', [nan]) * n, array('d', [nan]) * n
+            codes = array('b', bytes(n))
+            
+            for i, (ai, bi, ci) in enumerate(zip(a, b, c)):
+                if ai == 0:
+                    if bi != 0:
+                        codes[i] = ROOTS_LINEAR
+                        r1_re[i], r1_im[i] = -ci / bi, 0.0
+                    continue
+                disc = bi * bi - 4 * ai * ci
+                if disc > 0:
+                    codes[i] = ROOTS_REAL_DISTINCT
+                    r1_re[i], r2_re[i] = _stable_real_roots(ai, bi, ci, math.sqrt(disc))
+                    r1_im[i] = r2_im[i] = 0.0
+                elif disc == 0:
+                    codes[i] = ROOTS_REAL_REPEATED
+                    r1_re[i] = r2_re[i] = -bi / (2 * ai)
+                    r1_im[i] = r2_im[i] = 0.0
+                else:
+                    codes[i] = ROOTS_COMPLEX
+                    r1_re[i] = r2_re[i] = -bi / (2 * ai)
+                    spread = math.sqrt(-disc) / (2 * ai)
+                    r1_im[i], r2_im[i] = spread, -spread
+            return QuadraticRoots(r1_re, r1_im, r2_re, r2_im, codes)
         except Exception as e:
             self.error_message = str(e)
             return None
@@ -247,46 +2560,128 @@ class AdvancedMathCalculator:
     def solve_cubic(self, a: float, b: float, c: float, d: float) -> Dict:
         """
         Solve cubic equation: ax³ + bx² + cx + d = 0
-        Uses Cardano's formula
+        Trigonometric form for three real roots, real-cube-root Cardano
+        otherwise. Real roots are floats; a complex pair is complex.
         """
         try:
             if a == 0:
                 return self.solve_quadratic(b, c, d)
             
-            # Normalize to x³ + px + q = 0
             a, b, c, d = float(a), float(b), float(c), float(d)
+            # Discriminant of the depressed cubic t³ + pt + q = 0
             p = (3*a*c - b**2) / (3*a**2)
             q = (2*b**3 - 9*a*b*c + 27*a**2*d) / (27*a**3)
-            
             discriminant = -(4*p**3 + 27*q**2)
             
-            # Cardano's solution
-            inner = (q/2)**2 + (p/3)**3
-            sqrt_inner = cmath.sqrt(inner)
-            
-            c1 = ((-q/2) + sqrt_inner) ** (1/3)
-            c2 = ((-q/2) - sqrt_inner) ** (1/3)
-            
-            if abs(c1) < 1e-10:
-                c1_val = c2
+            r1, r2, r3, imag, real_count = _cubic_roots(a, b, c, d)
+            if real_count == 3:
+                solutions = [r1, r2, r3]
             else:
-                c1_val = c1
-            
-            omega = complex(-1/2, math.sqrt(3)/2)  # Cube root of unity
+                solutions = [r1, complex(r2, imag), complex(r3, -imag)]
+            return {'type': 'cubic', 'solutions': solutions, 'discriminant': discriminant}
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def solve_cubic_batch(self, a, b, c, d) -> CubicRoots:
+        """
+        Solve many cubics a[i]x³ + b[i]x² + c[i]x + d[i] = 0 at once.
+        Returns a CubicRoots of arrays; real roots are plain floats.
+        """
+        try:
+            if np is not None:
+                return self._solve_cubic_batch_numpy(a, b, c, d)
             
-            x1 = c1_val + c2 - b/(3*a)
-            x2 = omega*c1_val + omega**2*c2 - b/(3*a)
-            x3 = omega**2*c1_val + omega*c2 - b/(3*a)
+            a, b, c, d = (_numeric_view(v) for v in (a, b, c, d))
+            if not len(a) == len(b) == len(c) == len(d):
+                raise ValueError("Coefficient arrays must have the same length")
+            n = len(a)
+            nan = math.nan
+            r1, r2, r3 = array('d', [nan]) * n, array('d', [nan]) * n, array('d', [nan]) * n
+            imag = array('d', bytes(8 * n))
+            real_count = array('b', bytes(n))
             
-            return {
-                'type': 'cubic',
-                'solutions': [x1, x2, x3],
-                'discriminant': discriminant
-            }
+            for i, (ai, bi, ci, di) in enumerate(zip(a, b, c, d)):
+                if ai != 0:
+                    r1[i], r2[i], r3[i], imag[i], real_count[i] = _cubic_roots(ai, bi, ci, di)
+                elif bi != 0:
+                    disc = ci * ci - 4 * bi * di
+                    if disc >= 0:
+                        r1[i], r2[i] = sorted(_stable_real_roots(bi, ci, di, math.sqrt(disc)))
+                        real_count[i] = 2
+                    else:
+                        r2[i] = r3[i] = -ci / (2 * bi)
+                        imag[i] = abs(math.sqrt(-disc) / (2 * bi))
+                elif ci != 0:
+                    r1[i], real_count[i] = -di / ci, 1
+            return CubicRoots(r1, r2, r3, imag, real_count)
         except Exception as e:
             self.error_message = str(e)
             return None
     
+    def _solve_cubic_batch_numpy(self, a, b, c, d) -> CubicRoots:
+        a, b, c, d = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, c, d)))
+        cubic = a != 0
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            B, C, D = b / a, c / a, d / a
+            shift = B / 3
+            p = C - B * shift
+            q = (2 * B * B / 27 - C / 3) * B + D
+            half_q = q / 2
+            delta = half_q * half_q + (p / 3) ** 3
+            delta = np.where(np.abs(delta) <= 512 * _EPS * (half_q * half_q + np.abs(p / 3) ** 3),
+                             0.0, delta)
+            three_real = cubic & (delta < 0)
+            
+            # Trigonometric branch
+            m = 2 * np.sqrt(np.where(three_real, -p / 3, 0.0))
+            phi = np.arccos(np.clip(np.where(three_real, 3 * q / (p * m), 0.0), -1.0, 1.0))
+            trig = np.sort(np.stack([m * np.cos((phi - 2 * np.pi * k) / 3) - shift
+                                     for k in range(3)]), axis=0)
+            
+            # Cardano branch with real cube roots
+            w = -half_q - np.copysign(np.sqrt(np.maximum(delta, 0.0)), half_q)
+            u = np.cbrt(w)
+            v = np.where(u != 0, -p / (3 * u), 0.0)
+            real_root = u + v - shift
+            pair_real = -(u + v) / 2 - shift
+            imag = np.abs(np.sqrt(3) / 2 * (u - v))
+            repeated = cubic & ~three_real & ((delta == 0) | (imag == 0))
+            
+            def polish(x):
+                f = ((a * x + b) * x + c) * x + d
+                df = (3 * a * x + 2 * b) * x + c
+                y = np.where(df != 0, x - f / df, x)
+                better = np.abs(((a * y + b) * y + c) * y + d) <= np.abs(f)
+                return np.where(better, y, x)
+            
+            r1 = np.where(three_real, trig[0], real_root)
+            r2 = np.where(three_real, trig[1], pair_real)
+            r3 = np.where(three_real, trig[2], pair_real)
+            r1, r2, r3 = polish(r1), polish(r2), polish(r3)
+            rep = np.sort(np.stack([r1, r2, r3]), axis=0)
+            r1 = np.where(repeated, rep[0], r1)
+            r2 = np.where(repeated, rep[1], r2)
+            r3 = np.where(repeated, rep[2], r3)
+            imag = np.where(three_real | repeated, 0.0, imag)
+            real_count = np.where(three_real | repeated, 3, 1).astype(np.int8)
+        
+        if not cubic.all():
+            # Degree drops: reuse the quadratic batch solver on those lanes
+            lower = ~cubic
+            quad = self.solve_quadratic_batch(b[lower], c[lower], d[lower])
+            codes = quad.codes
+            lo = np.minimum(quad.root1_real, quad.root2_real)
+            hi = np.maximum(quad.root1_real, quad.root2_real)
+            real_pair = (codes == ROOTS_REAL_DISTINCT) | (codes == ROOTS_REAL_REPEATED)
+            complex_pair = codes == ROOTS_COMPLEX
+            r1[lower] = np.where(real_pair, lo, np.where(codes == ROOTS_LINEAR, quad.root1_real, np.nan))
+            r2[lower] = np.where(real_pair, hi, np.where(complex_pair, quad.root1_real, np.nan))
+            r3[lower] = np.where(complex_pair, quad.root1_real, np.nan)
+            imag[lower] = np.where(complex_pair, np.abs(quad.root1_imag), 0.0)
+            real_count[lower] = np.select([real_pair, codes == ROOTS_LINEAR], [2, 1], 0)
+        return CubicRoots(r1, r2, r3, imag, real_count)
+    
     def solve_linear(self, a: float, b: float) -> Dict:
         """Solve linear equation: ax + b = 0"""
         try:
@@ -303,7 +2698,7 @@ class AdvancedMathCalculator:
     # ==================== MATRIX OPERATIONS ====================
     
     def matrix_determinant(self, matrix: List[List[float]]) -> Union[float, None]:
-        """Calculate matrix determinant for 2x2 and 3x3 matrices."""
+        """Calculate matrix determinant (closed form up to 3x3, LU beyond)."""
         try:
             n = len(matrix)
             
@@ -319,7 +2714,7 @@ class AdvancedMathCalculator:
                 c = matrix[0][2]*(matrix[1][0]*matrix[2][1] - matrix[1][1]*matrix[2][0])
                 return a - b + c
             
-            raise ValueError("Only 1x1, 2x2, and 3x3 matrices supported")
+            return LUFactorization(matrix).determinant()
         except Exception as e:
             self.error_message = str(e)
             return None
@@ -339,9 +2734,44 @@ class AdvancedMathCalculator:
             self.error_message = str(e)
             return None
     
-    def matrix_transpose(self, matrix: List[List[float]]) -> List[List[float]]:
-        """Calculate matrix transpose."""
+    def lu_factorize(self, matrix: List[List[float]]) -> Union[LUFactorization, None]:
+        """
+        Factor a square matrix once for repeated solves.
+        Reuse the returned object: each solve() costs O(n²).
+        """
         try:
+            return LUFactorization(matrix)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def matrix_inverse(self, matrix: List[List[float]]) -> Union[List[List[float]], None]:
+        """Calculate inverse of an n×n matrix via LU decomposition."""
+        try:
+            lu = LUFactorization(matrix)
+            if lu.singular:
+                raise ValueError("Matrix is singular (determinant = 0)")
+            return lu.inverse()
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def matrix_transpose(self, matrix: List[List[float]], view: bool = False):
+        """
+        Calculate matrix transpose.
+        view=True returns a zero-copy transposed view (FlatMatrix or ndarray)
+        instead of rebuilding nested lists.
+        """
+        try:
+            if isinstance(matrix, SparseMatrix):
+                return matrix.transpose()
+            if view:
+                if np is not None and isinstance(matrix, np.ndarray):
+                    return matrix.T
+                return FlatMatrix.from_rows(matrix).T
+            if isinstance(matrix, FlatMatrix):
+                return matrix.T.to_rows()
+            
             rows = len(matrix)
             cols = len(matrix[0])
             return [[matrix[i][j] for i in range(rows)] for j in range(cols)]
@@ -351,22 +2781,186 @@ class AdvancedMathCalculator:
     
     def matrix_multiply(self, mat1: List[List[float]], 
                        mat2: List[List[float]]) -> Union[List[List[float]], None]:
-        """Multiply two matrices."""
+        """
+        Multiply two matrices. NumPy matmul is used for ndarray or FlatMatrix
+        operands and for all-float nested lists; anything else (ints,
+        complex, Fractions) keeps exact Python arithmetic and its types.
+        """
         try:
+            if isinstance(mat1, SparseMatrix):
+                return mat1 @ mat2
+            if isinstance(mat2, SparseMatrix):
+                # A·S = (Sᵀ·Aᵀ)ᵀ keeps the work proportional to S's nonzeros
+                return self.matrix_transpose(mat2.transpose().multiply_dense(
+                    self.matrix_transpose(mat1)))
+            if isinstance(mat1, FlatMatrix) or isinstance(mat2, FlatMatrix) or (
+                    np is not None and all(isinstance(m, np.ndarray) or _float_rows(m)
+                                           for m in (mat1, mat2))):
+                result = self.matrix_multiply_flat(mat1, mat2)
+                if result is None:
+                    return None
+                return result.tolist() if np is not None else result.to_rows()
+            
             rows1, cols1 = len(mat1), len(mat1[0])
             rows2, cols2 = len(mat2), len(mat2[0])
             
             if cols1 != rows2:
                 raise ValueError(f"Cannot multiply {rows1}x{cols1} by {rows2}x{cols2}")
             
-            result = [[0]*cols2 for _ in range(rows1)]
+            # Row-by-column dot products run in C via sum(map(mul))
+            columns = list(zip(*mat2))
+            return [[sum(map(operator.mul, row, col)) for col in columns] for row in mat1]
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def matrix_multiply_flat(self, mat1, mat2, block_size: int = 256):
+        """
+        Multiply nested lists, FlatMatrix objects or arrays without
+        converting back to nested lists.
+        Returns an ndarray when NumPy is available, otherwise a FlatMatrix.
+        """
+        try:
+            if np is not None:
+                a, b = _matmul_operand(mat1), _matmul_operand(mat2)
+                if a.ndim != 2 or b.ndim != 2 or a.shape[1] != b.shape[0]:
+                    raise ValueError(f"Cannot multiply {a.shape[0]}x{a.shape[-1]} "
+                                     f"by {b.shape[0]}x{b.shape[-1]}")
+                return a @ b
+            
+            a = FlatMatrix.from_rows(mat1)
+            b = FlatMatrix.from_rows(mat2)
+            if a.cols != b.rows:
+                raise ValueError(f"Cannot multiply {a.rows}x{a.cols} by {b.rows}x{b.cols}")
+            return _tiled_matmul(a, b, block_size)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def sparse_matrix(self, rows: int, cols: int, triplets) -> Union[SparseMatrix, None]:
+        """Build a CSR sparse matrix from (row, col, value) triplets."""
+        try:
+            return SparseMatrix.from_triplets(rows, cols, triplets)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def conjugate_gradient(self, matrix, constants: List[float], 
+                           initial_guess: List[float] = None, 
+                           tolerance: float = 1e-10, 
+                           max_iterations: int = None) -> Dict:
+        """
+        Solve A·x = b for symmetric positive-definite A (sparse or dense)
+        with the conjugate gradient method. Stops when ||b - A·x|| ≤ tolerance·||b||.
+        """
+        try:
+            n, matvec = _linear_operator(matrix)
+            _check_system_vectors(n, constants, initial_guess)
+            max_iterations = max_iterations or 10 * n
+            x = list(initial_guess) if initial_guess is not None else [0.0] * n
+            b_norm = math.sqrt(_dot(constants, constants)) or 1.0
+            
+            r = [bi - ai for bi, ai in zip(constants, matvec(x))]
+            p = list(r)
+            rs = _dot(r, r)
+            iterations = 0
             
-            for i in range(rows1):
-                for j in range(cols2):
-                    for k in range(cols1):
-                        result[i][j] += mat1[i][k] * mat2[k][j]
+            while math.sqrt(rs) > tolerance * b_norm and iterations < max_iterations:
+                ap = matvec(p)
+                curvature = _dot(p, ap)
+                if curvature <= 0:
+                    raise ValueError("Matrix is not positive definite")
+                alpha = rs / curvature
+                x = [xi + alpha * pi for xi, pi in zip(x, p)]
+                r = [ri - alpha * api for ri, api in zip(r, ap)]
+                rs_new = _dot(r, r)
+                p = [ri + (rs_new / rs) * pi for ri, pi in zip(r, p)]
+                rs = rs_new
+                iterations += 1
             
-            return result
+            return {
+                'solution': x,
+                'iterations': iterations,
+                'residual_norm': math.sqrt(rs),
+                'converged': math.sqrt(rs) <= tolerance * b_norm
+            }
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def gmres(self, matrix, constants: List[float], 
+              initial_guess: List[float] = None, 
+              tolerance: float = 1e-10, restart: int = 30, 
+              max_iterations: int = None) -> Dict:
+        """
+        Solve A·x = b for general square A (sparse or dense) with restarted
+        GMRES(restart). Stops when ||b - A·x|| ≤ tolerance·||b||.
+        """
+        try:
+            n, matvec = _linear_operator(matrix)
+            _check_system_vectors(n, constants, initial_guess)
+            max_iterations = max_iterations or 10 * n
+            restart = max(1, min(restart, n))
+            x = list(initial_guess) if initial_guess is not None else [0.0] * n
+            b_norm = math.sqrt(_dot(constants, constants)) or 1.0
+            target = tolerance * b_norm
+            iterations = 0
+            
+            while True:
+                r = [bi - ai for bi, ai in zip(constants, matvec(x))]
+                beta = math.sqrt(_dot(r, r))
+                if beta <= target or iterations >= max_iterations:
+                    break
+                
+                basis = [[ri / beta for ri in r]]
+                hessenberg = []  # column j holds h[0..j+1][j]
+                cosines, sines = [], []
+                g = [beta]
+                
+                for j in range(restart):
+                    # Arnoldi step with modified Gram–Schmidt
+                    w = matvec(basis[j])
+                    column = []
+                    for v in basis:
+                        h = _dot(w, v)
+                        w = [wi - h * vi for wi, vi in zip(w, v)]
+                        column.append(h)
+                    w_norm = math.sqrt(_dot(w, w))
+                    column.append(w_norm)
+                    
+                    # Apply earlier Givens rotations, then zero the subdiagonal
+                    for i, (c, s) in enumerate(zip(cosines, sines)):
+                        column[i], column[i + 1] = (c * column[i] + s * column[i + 1],
+                                                    -s * column[i] + c * column[i + 1])
+                    denom = math.hypot(column[j], column[j + 1])
+                    c, s = (1.0, 0.0) if denom == 0 else (column[j] / denom, column[j + 1] / denom)
+                    column[j], column[j + 1] = denom, 0.0
+                    cosines.append(c)
+                    sines.append(s)
+                    g.append(-s * g[j])
+                    g[j] = c * g[j]
+                    hessenberg.append(column)
+                    iterations += 1
+                    
+                    if abs(g[j + 1]) <= target or w_norm == 0 or iterations >= max_iterations:
+                        break
+                    basis.append([wi / w_norm for wi in w])
+                
+                # Back-substitute the triangularized least-squares system
+                k = len(hessenberg)
+                y = [0.0] * k
+                for i in range(k - 1, -1, -1):
+                    total = g[i] - sum(hessenberg[m][i] * y[m] for m in range(i + 1, k))
+                    y[i] = total / hessenberg[i][i] if hessenberg[i][i] else 0.0
+                for yi, v in zip(y, basis):
+                    x = [xi + yi * vi for xi, vi in zip(x, v)]
+            
+            return {
+                'solution': x,
+                'iterations': iterations,
+                'residual_norm': beta,
+                'converged': beta <= target
+            }
         except Exception as e:
             self.error_message = str(e)
             return None
@@ -376,9 +2970,11 @@ class AdvancedMathCalculator:
     def polynomial_evaluate(self, coefficients: List[float], x: float) -> float:
         """
         Evaluate polynomial at x using Horner's method.
-        coefficients: [a₀, a₁, a₂, ...] for a₀ + a₁x + a₂x² + ...
+        coefficients: [a₀, a₁, a₂, ...] for a₀ + a₁x + a₂x² + ... or a Polynomial
         """
         try:
+            if isinstance(coefficients, Polynomial):
+                return coefficients(x)
             result = 0
             for i, coef in enumerate(reversed(coefficients)):
                 result = result * x + coef
@@ -387,9 +2983,41 @@ class AdvancedMathCalculator:
             self.error_message = str(e)
             return None
     
+    def polynomial_evaluate_batch(self, coefficients: List[float], xs):
+        """
+        Evaluate polynomial at every point of xs using Horner's method.
+        xs may be a NumPy array, array.array or any buffer of numbers.
+        Returns a NumPy array when NumPy is available, otherwise array('d').
+        """
+        try:
+            if isinstance(coefficients, Polynomial):
+                return coefficients.evaluate_many(xs)
+            if np is not None:
+                points = np.asarray(xs, dtype=float)
+                result = np.zeros_like(points)
+                for coef in reversed(coefficients):
+                    result *= points
+                    result += coef
+                return result
+            
+            points = _as_float_array(xs)
+            if not coefficients:
+                return array('d', bytes(8 * len(points)))
+            # One pass over all points per coefficient instead of one call per point
+            coeffs = list(reversed(coefficients))
+            result = [float(coeffs[0])] * len(points)
+            for coef in coeffs[1:]:
+                result = [r * x + coef for r, x in zip(result, points)]
+            return array('d', result)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
     def polynomial_derivative(self, coefficients: List[float]) -> List[float]:
-        """Get derivative coefficients of polynomial."""
+        """Get derivative coefficients of polynomial (a cached Polynomial for Polynomial input)."""
         try:
+            if isinstance(coefficients, Polynomial):
+                return coefficients.derivative()
             if len(coefficients) <= 1:
                 return [0]
             return [i * coefficients[i] for i in range(1, len(coefficients))]
@@ -397,14 +3025,28 @@ class AdvancedMathCalculator:
             self.error_message = str(e)
             return None
     
+    def polynomial_antiderivative(self, coefficients: List[float]) -> List[float]:
+        """Get antiderivative coefficients of polynomial (constant term 0)."""
+        try:
+            if isinstance(coefficients, Polynomial):
+                return coefficients.antiderivative()
+            return [0] + [coef / (i + 1) for i, coef in enumerate(coefficients)]
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
     def find_polynomial_roots_newton(self, coefficients: List[float], 
                                      initial_guess: float = 1.0, 
                                      tolerance: float = 1e-10, 
                                      max_iterations: int = 100) -> List[float]:
-        """Use Newton-Raphson method to find polynomial roots."""
+        """
+        Use Newton-Raphson method to find polynomial roots.
+        Prefer find_polynomial_roots, which finds every complex root at once.
+        """
         try:
             roots = []
-            working_coeffs = coefficients.copy()
+            working_coeffs = list(coefficients)
+            deriv_coeffs = self.polynomial_derivative(working_coeffs)
             
             for _ in range(len(coefficients) - 1):
                 root = initial_guess
@@ -416,8 +3058,6 @@ class AdvancedMathCalculator:
                     if abs(f_x) < tolerance:
                         break
                     
-                    # Calculate derivative
-                    deriv_coeffs = self.polynomial_derivative(working_coeffs)
                     f_prime = self.polynomial_evaluate(deriv_coeffs, x)
                     
                     if abs(f_prime) < 1e-15:
@@ -433,6 +3073,74 @@ class AdvancedMathCalculator:
             self.error_message = str(e)
             return None
     
+    def find_polynomial_roots(self, coefficients: List[float], 
+                              tolerance: float = 1e-12, 
+                              max_iterations: int = 100) -> Dict:
+        """
+        Find all complex roots at once using the Aberth–Ehrlich method.
+        Returns roots, a per-root error bound (disk radius guaranteed to
+        contain a true root), the iterations used and a convergence flag.
+        """
+        try:
+            roots, bounds, iterations, converged = _aberth_roots(
+                coefficients, tolerance, max_iterations)
+            return {
+                'roots': roots,
+                'error_bounds': bounds,
+                'iterations': iterations,
+                'converged': converged
+            }
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def find_polynomial_roots_batch(self, polynomials: List[List[float]], 
+                                    tolerance: float = 1e-12, 
+                                    max_iterations: int = 100) -> List[Dict]:
+        """
+        Solve many polynomials in one call.
+        Entries that fail are None; the last failure is kept in error_message.
+        """
+        return [self.find_polynomial_roots(coeffs, tolerance, max_iterations)
+                for coeffs in polynomials]
+    
+    def polynomial(self, coefficients: List[float]) -> Union[Polynomial, None]:
+        """Wrap coefficients [a₀, a₁, ...] in a Polynomial with cached calculus and evaluator."""
+        try:
+            return Polynomial(coefficients)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def polynomial_multiply(self, p, q):
+        """
+        Product of two polynomials. Long integer inputs are multiplied exactly
+        through one big-integer product, long float inputs by FFT convolution.
+        Returns a list for list inputs and a Polynomial otherwise.
+        """
+        try:
+            return _polynomial_like(Polynomial(p) * Polynomial(q), p, q)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def polynomial_divide(self, p, q) -> Tuple:
+        """Polynomial long division: returns (quotient, remainder) with p = q·quotient + remainder."""
+        try:
+            quotient, remainder = divmod(Polynomial(p), Polynomial(q))
+            return _polynomial_like(quotient, p, q), _polynomial_like(remainder, p, q)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def polynomial_compose(self, p, q):
+        """Composition p(q(x))."""
+        try:
+            return _polynomial_like(Polynomial(p).compose(q), p, q)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
     # ==================== TRIGONOMETRIC WITH INVERSE ====================
     
     def inverse_sine(self, value: float, mode: str = 'deg') -> Union[float, None]:
@@ -476,11 +3184,16 @@ class AdvancedMathCalculator:
     
     def numerical_derivative(self, coefficients: List[float], x: float, 
                             h: float = 1e-7) -> float:
-        """Approximate derivative using numerical differentiation."""
+        """
+        Derivative at x. Polynomials use their exact derivative coefficients;
+        any other callable f(x) goes through differentiate() with an
+        automatic step, so h is no longer used.
+        """
         try:
-            f_x_plus = self.polynomial_evaluate(coefficients, x + h)
-            f_x_minus = self.polynomial_evaluate(coefficients, x - h)
-            return (f_x_plus - f_x_minus) / (2 * h)
+            if callable(coefficients) and not isinstance(coefficients, Polynomial):
+                result = self.differentiate(coefficients, x)
+                return None if result is None else result['derivative']
+            return self.polynomial_evaluate(self.polynomial_derivative(coefficients), x)
         except Exception as e:
             self.error_message = str(e)
             return None
@@ -490,14 +3203,14 @@ class AdvancedMathCalculator:
         """Calculate definite integral using trapezoid rule."""
         try:
             h = (b - a) / n
-            result = (self.polynomial_evaluate(coefficients, a) + 
-                     self.polynomial_evaluate(coefficients, b)) / 2
+            ys = self.polynomial_evaluate_batch(coefficients, _sample_grid(a, b, n))
             
-            for i in range(1, n):
-                x = a + i * h
-                result += self.polynomial_evaluate(coefficients, x)
+            if np is not None:
+                interior = float(ys[1:-1].sum())
+            else:
+                interior = math.fsum(ys[1:-1])
             
-            return result * h
+            return ((ys[0] + ys[-1]) / 2 + interior) * h
         except Exception as e:
             self.error_message = str(e)
             return None
@@ -510,18 +3223,211 @@ class AdvancedMathCalculator:
                 n += 1
             
             h = (b - a) / n
-            result = (self.polynomial_evaluate(coefficients, a) + 
-                     self.polynomial_evaluate(coefficients, b))
+            ys = self.polynomial_evaluate_batch(coefficients, _sample_grid(a, b, n))
+            
+            if np is not None:
+                odd = float(ys[1:-1:2].sum())
+                even = float(ys[2:-1:2].sum())
+            else:
+                odd = math.fsum(ys[1:-1:2])
+                even = math.fsum(ys[2:-1:2])
+            
+            return (ys[0] + ys[-1] + 4 * odd + 2 * even) * h / 3
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def polynomial_integral(self, coefficients: List[float], 
+                            a: float, b: float) -> float:
+        """Exact definite integral of a polynomial in O(degree)."""
+        try:
+            if isinstance(coefficients, Polynomial):
+                return coefficients.integral(a, b)
+            antiderivative = self.polynomial_antiderivative(coefficients)
+            return (self.polynomial_evaluate(antiderivative, b) - 
+                    self.polynomial_evaluate(antiderivative, a))
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def adaptive_integral(self, func, a: float, b: float, 
+                          tolerance: float = 1e-10, 
+                          max_evaluations: int = 10000) -> Dict:
+        """
+        Adaptive Gauss–Kronrod (7/15) quadrature.
+        func may be a callable f(x) or a polynomial coefficient list.
+        Repeatedly bisects the interval with the largest error estimate until
+        the total estimate is within tolerance or the evaluation budget is spent.
+        """
+        try:
+            if max_evaluations < 15:
+                raise ValueError("Evaluation budget must allow at least 15 evaluations")
+            
+            if callable(func):
+                batch = lambda xs: [func(x) for x in xs]
+            else:
+                coefficients = list(func)
+                batch = lambda xs: self.polynomial_evaluate_batch(coefficients, xs)
             
-            for i in range(1, n, 2):
-                x = a + i * h
-                result += 4 * self.polynomial_evaluate(coefficients, x)
+            value, error = _gauss_kronrod_15(batch, a, b)
+            evaluations = 15
+            # Max-heap of panels keyed on their error estimate
+            panels = [(-error, a, b, value, error)]
             
-            for i in range(2, n-1, 2):
-                x = a + i * h
-                result += 2 * self.polynomial_evaluate(coefficients, x)
+            while error > tolerance and evaluations + 30 <= max_evaluations:
+                _, lo, hi, panel_value, panel_error = heapq.heappop(panels)
+                mid = (lo + hi) / 2
+                left_value, left_error = _gauss_kronrod_15(batch, lo, mid)
+                right_value, right_error = _gauss_kronrod_15(batch, mid, hi)
+                evaluations += 30
+                
+                heapq.heappush(panels, (-left_error, lo, mid, left_value, left_error))
+                heapq.heappush(panels, (-right_error, mid, hi, right_value, right_error))
+                value += left_value + right_value - panel_value
+                error += left_error + right_error - panel_error
+            
+            # Re-sum to shed the drift of the incremental updates
+            value = math.fsum(panel[3] for panel in panels)
+            error = math.fsum(panel[4] for panel in panels)
+            
+            return {
+                'value': value,
+                'error_estimate': error,
+                'evaluations': evaluations,
+                'converged': error <= tolerance
+            }
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def differentiate(self, func, x: float, step: float = None, 
+                      vectorized: bool = False) -> Dict:
+        """
+        Derivative of any callable f(x) by Richardson extrapolation of central
+        differences (Ridders' method). step is the largest step tried; by
+        default it is chosen from |x| and shrunk automatically while the error
+        estimate is large next to the derivative (e.g. near a pole); if that never
+        settles, the call fails. With vectorized=True, f is called
+        once with an array of all perturbed points and must return an array.
+        """
+        try:
+            step = step or _initial_step(x)
+            evaluate = _point_evaluator(func, vectorized, scalar_argument=True)
+            estimates, errors, evaluations = _reliable_partials(evaluate, [x], [step])
+            return {
+                'derivative': estimates[0][0],
+                'error_estimate': errors[0][0],
+                'evaluations': evaluations
+            }
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def gradient(self, func, x: List[float], step: float = None, 
+                 vectorized: bool = False) -> Dict:
+        """
+        Gradient of a scalar function f(point) at x. All perturbed points are
+        built first and evaluated as one batch; with vectorized=True, f gets
+        them in a single call as a (points × len(x)) array.
+        """
+        try:
+            x = [float(v) for v in x]
+            steps = [step or _initial_step(v) for v in x]
+            evaluate = _point_evaluator(func, vectorized, scalar_argument=False)
+            estimates, errors, evaluations = _reliable_partials(evaluate, x, steps)
+            if any(len(partial) != 1 for partial in estimates):
+                raise ValueError("Function must return a scalar; use jacobian for vector outputs")
+            return {
+                'gradient': [partial[0] for partial in estimates],
+                'error_estimates': [error[0] for error in errors],
+                'evaluations': evaluations
+            }
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def jacobian(self, func, x: List[float], step: float = None, 
+                 vectorized: bool = False) -> Dict:
+        """
+        Jacobian J[i][k] = ∂f_i/∂x_k of a vector function f(point) at x, with
+        the same batched evaluation as gradient (vectorized f returns a
+        (points × outputs) array).
+        """
+        try:
+            x = [float(v) for v in x]
+            steps = [step or _initial_step(v) for v in x]
+            evaluate = _point_evaluator(func, vectorized, scalar_argument=False)
+            estimates, errors, evaluations = _reliable_partials(evaluate, x, steps)
+            return {
+                'jacobian': [list(row) for row in zip(*estimates)],
+                'error_estimates': [list(row) for row in zip(*errors)],
+                'evaluations': evaluations
+            }
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    # ==================== ROOT FINDING ====================
+    
+    def find_root(self, func, a: float, b: float, tolerance: float = 1e-12, 
+                  max_iterations: int = 100, method: str = 'brent') -> Dict:
+        """
+        Root of a callable f(x) inside a bracket [a, b] where f changes sign.
+        method: 'brent' (inverse quadratic interpolation with bisection
+        fallback) or 'illinois' (modified regula falsi). The result stays
+        bracketed, so convergence is guaranteed for continuous f.
+        """
+        try:
+            if method == 'brent':
+                root, iterations, width, converged = _brent_root(
+                    func, float(a), float(b), tolerance, max_iterations)
+            elif method == 'illinois':
+                scalar_func = lambda xs: [func(x) for x in xs]
+                roots, iteration_counts, widths, converged = _illinois_lanes(
+                    scalar_func, [a], [b], (), tolerance, max_iterations)
+                if math.isnan(roots[0]) and not converged[0]:
+                    raise ValueError("f(a) and f(b) must have opposite signs")
+                root, iterations, width, converged = (roots[0], iteration_counts[0], 
+                                                      widths[0], converged[0])
+            else:
+                raise ValueError(f"Unknown method: {method}")
+            return {
+                'root': root,
+                'iterations': iterations,
+                'bracket_width': width,
+                'converged': converged
+            }
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def find_root_batch(self, func, lower, upper, args: Tuple = (), 
+                        tolerance: float = 1e-12, 
+                        max_iterations: int = 100) -> BracketedRoots:
+        """
+        Solve many bracketed problems in lockstep with the Illinois method.
+        func(xs, *args) is called once per iteration with the x values of the
+        problems still running and the matching slices of each array in args
+        (per-problem parameters); it returns f at those points. Converged
+        problems drop out, so later calls get shorter arrays. xs is an
+        ndarray when NumPy is available, otherwise a list.
+        """
+        try:
+            if np is not None:
+                return BracketedRoots(*_illinois_lanes_numpy(
+                    func, lower, upper, args, tolerance, max_iterations))
             
-            return result * h / 3
+            lower, upper = _numeric_view(lower), _numeric_view(upper)
+            if len(lower) != len(upper):
+                raise ValueError("Lower and upper bounds must have the same length")
+            n = len(lower)
+            args = [arg if hasattr(arg, '__len__') else [arg] * n for arg in args]
+            if any(len(arg) != n for arg in args):
+                raise ValueError("Parameter arrays must have one entry per problem")
+            roots, iterations, widths, converged = _illinois_lanes(
+                func, lower, upper, args, tolerance, max_iterations)
+            return BracketedRoots(array('d', roots), array('l', iterations), 
+                                  array('d', widths), array('b', converged))
         except Exception as e:
             self.error_message = str(e)
             return None
@@ -569,6 +3475,121 @@ class AdvancedMathCalculator:
             self.error_message = str(e)
             return None
     
+    def complex_to_polar_batch(self, real, imag=None, mode: str = 'deg', out=None):
+        """
+        Convert many complex numbers to polar form in one call.
+        Input is parallel real/imag arrays or one complex array (imag=None).
+        Returns (magnitudes, angles), angles in degrees unless mode='rad',
+        written into out=(mag, ang) if supplied. The default mode matches
+        complex_from_polar(_batch), so a default round trip is the identity.
+        """
+        try:
+            z = _complex_values(real, imag)
+            out_mag, out_ang = out if out is not None else (None, None)
+            if np is not None:
+                angles = np.angle(z, deg=(mode == 'deg'))
+                return _store(out_mag, np.abs(z)), _store(out_ang, angles)
+            angles = [cmath.phase(v) for v in z]
+            if mode == 'deg':
+                angles = [math.degrees(a) for a in angles]
+            return _store(out_mag, [abs(v) for v in z]), _store(out_ang, angles)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def complex_from_polar_batch(self, magnitude, angle, mode: str = 'deg', out=None):
+        """Convert arrays of magnitudes and angles (degrees unless mode='rad') to (real, imag) arrays."""
+        try:
+            if np is not None:
+                mag = np.asarray(magnitude, dtype=float)
+                ang = np.asarray(angle, dtype=float)
+                if mode == 'deg':
+                    ang = np.radians(ang)
+                return _split_complex(mag * np.exp(1j * ang), out)
+            mag, ang = _numeric_view(magnitude), _numeric_view(angle)
+            if len(mag) != len(ang):
+                raise ValueError("Magnitude and angle arrays must have the same length")
+            if mode == 'deg':
+                ang = [math.radians(a) for a in ang]
+            return _split_complex([cmath.rect(r, a) for r, a in zip(mag, ang)], out)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def complex_operations_batch(self, real1, imag1, real2, imag2, 
+                                 operation: str, out=None):
+        """
+        Apply +, -, * or / elementwise to two complex arrays given as
+        parallel real/imag arrays. Returns (real, imag) arrays.
+        """
+        try:
+            z1 = _complex_values(real1, imag1)
+            z2 = _complex_values(real2, imag2)
+            if len(z1) != len(z2):
+                raise ValueError("Operand arrays must have the same length")
+            
+            if np is not None:
+                kernels = {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.divide}
+                if operation not in kernels:
+                    raise ValueError(f"Unknown operation: {operation}")
+                if operation == '/' and np.any(z2 == 0):
+                    raise ValueError("Division by zero")
+                return _split_complex(kernels[operation](z1, z2), out)
+            
+            kernels = {'+': operator.add, '-': operator.sub, 
+                       '*': operator.mul, '/': operator.truediv}
+            if operation not in kernels:
+                raise ValueError(f"Unknown operation: {operation}")
+            if operation == '/' and any(v == 0 for v in z2):
+                raise ValueError("Division by zero")
+            return _split_complex(list(map(kernels[operation], z1, z2)), out)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def complex_power_batch(self, real, imag, power_real, 
+                            power_imag: float = 0, out=None):
+        """
+        Raise an array of complex numbers to a complex power (a scalar or an
+        array of exponents). Returns (real, imag) arrays.
+        """
+        try:
+            z = _complex_values(real, imag)
+            if isinstance(power_real, (int, float)) and isinstance(power_imag, (int, float)):
+                power = complex(power_real, power_imag)
+                if np is not None:
+                    return _split_complex(np.power(z, power), out)
+                return _split_complex([v ** power for v in z], out)
+            
+            if isinstance(power_imag, (int, float)):
+                power_imag = [power_imag] * len(z)
+            powers = _complex_values(power_real, power_imag)
+            if len(powers) != len(z):
+                raise ValueError("Exponent array must match the input length")
+            if np is not None:
+                return _split_complex(np.power(z, powers), out)
+            return _split_complex([v ** p for v, p in zip(z, powers)], out)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def fft(self, real, imag=None, inverse: bool = False, out=None):
+        """
+        Discrete Fourier transform of a complex array (any length).
+        The inverse transform is scaled by 1/n. Returns (real, imag) arrays.
+        """
+        try:
+            z = _complex_values(real, imag)
+            if np is not None:
+                return _split_complex(np.fft.ifft(z) if inverse else np.fft.fft(z), out)
+            result = _fft(z, inverse)
+            if inverse and result:
+                result = [v / len(result) for v in result]
+            return _split_complex(result, out)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
     # ==================== SYSTEM OF LINEAR EQUATIONS ====================
     
     def solve_2x2_system(self, a1: float, b1: float, c1: float,
@@ -594,51 +3615,90 @@ class AdvancedMathCalculator:
     
     def solve_3x3_system(self, matrix: List[List[float]], 
                         constants: List[float]) -> Dict:
-        """Solve 3x3 system using Cramer's rule."""
+        """Solve 3x3 system using LU decomposition."""
         try:
-            det = self.matrix_determinant(matrix)
+            if len(matrix) != 3:
+                raise ValueError("Expected a 3x3 coefficient matrix")
             
-            if det == 0:
+            lu = LUFactorization(matrix)
+            
+            if lu.singular:
                 return {'type': 'no_unique_solution'}
             
-            solutions = {}
+            return {'type': 'unique', 'solutions': dict(zip('xyz', lu.solve(constants)))}
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def solve_linear_system(self, matrix: List[List[float]], 
+                           constants: List[float]) -> Dict:
+        """Solve an n×n system A·x = b using LU decomposition."""
+        try:
+            lu = LUFactorization(matrix)
             
-            for j in range(3):
-                # Create modified matrix with constants
-                mod_matrix = [row.copy() for row in matrix]
-                for i in range(3):
-                    mod_matrix[i][j] = constants[i]
-                
-                det_mod = self.matrix_determinant(mod_matrix)
-                solutions[chr(120 + j)] = det_mod / det  # x, y, z
+            if lu.singular:
+                return {'type': 'no_unique_solution'}
             
-            return {'type': 'unique', 'solutions': solutions}
+            return {'type': 'unique', 'solutions': lu.solve(constants)}
         except Exception as e:
             self.error_message = str(e)
             return None
     
     # ==================== ADVANCED STATISTICS ====================
     
-    def calculate_quartiles(self, data: List[float]) -> Dict:
-        """Calculate Q1, Q2 (median), Q3."""
+    def calculate_quartiles(self, data: List[float], method: str = 'sort') -> Dict:
+        """
+        Calculate Q1, Q2 (median), Q3.
+        method='select' finds only the needed order statistics with
+        np.partition (expected linear time, no full sort) when NumPy is
+        available and sorts otherwise; results are identical to method='sort'.
+        """
         try:
-            sorted_data = sorted(data)
-            n = len(sorted_data)
+            data = _numeric_view(data)
+            n = len(data)
             
-            q2 = sorted_data[n//2] if n % 2 == 1 else (sorted_data[n//2-1] + sorted_data[n//2]) / 2
-            q1 = sorted_data[n//4] if n % 4 == 0 else (sorted_data[n//4] + sorted_data[n//4+1]) / 2
-            q3 = sorted_data[3*n//4] if n % 4 == 0 else (sorted_data[3*n//4] + sorted_data[3*n//4+1]) / 2
+            q2_ranks = [n//2] if n % 2 == 1 else [n//2-1, n//2]
+            q1_ranks = [n//4] if n % 4 == 0 else [n//4, n//4+1]
+            q3_ranks = [3*n//4] if n % 4 == 0 else [3*n//4, 3*n//4+1]
+            ranks = q1_ranks + q2_ranks + q3_ranks
+            if any(r >= n for r in ranks):
+                raise IndexError("list index out of range")
             
-            iqr = q3 - q1
+            if method == 'sort':
+                sorted_data = sorted(data)
+                stats = {r: sorted_data[r] for r in ranks}
+            elif method == 'select':
+                stats = _select_order_statistics(data, ranks)
+            else:
+                raise ValueError(f"Unknown quartile method: {method}")
             
-            return {
-                'Q1': q1,
-                'Q2_median': q2,
-                'Q3': q3,
-                'IQR': iqr,
-                'lower_fence': q1 - 1.5*iqr,
-                'upper_fence': q3 + 1.5*iqr
-            }
+            def average(rs):
+                return stats[rs[0]] if len(rs) == 1 else (stats[rs[0]] + stats[rs[1]]) / 2
+            
+            return _quartile_summary(average(q1_ranks), average(q2_ranks), average(q3_ranks))
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def streaming_quartiles(self, chunks, k: int = 200) -> Dict:
+        """
+        Approximate quartiles of an iterator of chunks in O(k) memory.
+        See QuantileSketch for the rank-error guarantee.
+        """
+        try:
+            sketch = QuantileSketch(k)
+            for chunk in chunks:
+                sketch.update(chunk)
+            return self.summarize_quantiles(sketch)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def summarize_quantiles(self, sketch: QuantileSketch) -> Dict:
+        """Report quartiles and fences held by a (possibly merged) sketch."""
+        try:
+            return _quartile_summary(sketch.quantile(0.25), sketch.quantile(0.5), 
+                                     sketch.quantile(0.75))
         except Exception as e:
             self.error_message = str(e)
             return None
@@ -646,6 +3706,7 @@ class AdvancedMathCalculator:
     def calculate_skewness(self, data: List[float]) -> Union[float, None]:
         """Calculate coefficient of skewness."""
         try:
+            data = _numeric_view(data)
             n = len(data)
             mean = sum(data) / n
             std = (sum((x - mean)**2 for x in data) / n) ** 0.5
@@ -658,6 +3719,7 @@ class AdvancedMathCalculator:
     def calculate_kurtosis(self, data: List[float]) -> Union[float, None]:
         """Calculate coefficient of kurtosis."""
         try:
+            data = _numeric_view(data)
             n = len(data)
             mean = sum(data) / n
             std = (sum((x - mean)**2 for x in data) / n) ** 0.5
@@ -667,6 +3729,81 @@ class AdvancedMathCalculator:
             self.error_message = str(e)
             return None
     
+    def streaming_statistics(self, chunks) -> Dict:
+        """
+        Mean, standard deviation, skewness and kurtosis in one pass over an
+        iterator of chunks, holding only one chunk in memory at a time.
+        """
+        try:
+            acc = MomentAccumulator()
+            for chunk in chunks:
+                acc.update(chunk)
+            return self.summarize_moments(acc)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def file_statistics(self, path: str, dtype: str = 'd', 
+                        chunk_items: int = 1 << 20, 
+                        quartiles: bool = True, k: int = 200) -> Dict:
+        """
+        Statistics of a raw binary file of native-endian numbers (dtype is an
+        array typecode, 'd' for float64). The file is memory-mapped and
+        processed chunk by chunk, so it is never copied into Python objects.
+        Quartiles come from a QuantileSketch and are approximate.
+        """
+        try:
+            item_size = array(dtype).itemsize
+            moments = MomentAccumulator()
+            sketch = QuantileSketch(k) if quartiles else None
+            
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size % item_size:
+                    raise ValueError(f"File size is not a multiple of {item_size} bytes")
+                if size == 0:
+                    raise ValueError("File is empty")
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as raw, raw.cast(dtype) as values:
+                        for start in range(0, len(values), chunk_items):
+                            with values[start:start + chunk_items] as chunk:
+                                if np is not None:
+                                    block = np.frombuffer(chunk, dtype=dtype)
+                                    moments.update(block)
+                                    if sketch is not None:
+                                        sketch.update(block)
+                                    del block
+                                else:
+                                    moments.update(chunk)
+                                    if sketch is not None:
+                                        sketch.update(chunk)
+            
+            result = self.summarize_moments(moments)
+            if result is not None and sketch is not None:
+                result['quartiles'] = self.summarize_quantiles(sketch)
+            return result
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def summarize_moments(self, accumulator: MomentAccumulator) -> Dict:
+        """Report the statistics held by a (possibly merged) accumulator."""
+        try:
+            if accumulator.count < 2:
+                raise ValueError("Need at least 2 data points")
+            if accumulator.m2 == 0:
+                raise ValueError("Data has zero variance")
+            return {
+                'count': accumulator.count,
+                'mean': accumulator.mean,
+                'standard_deviation': accumulator.standard_deviation(),
+                'skewness': accumulator.skewness(),
+                'kurtosis': accumulator.kurtosis()
+            }
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
     # ==================== VECTOR OPERATIONS ====================
     
     def vector_magnitude(self, vector: List[float]) -> Union[float, None]:
@@ -725,6 +3862,87 @@ class AdvancedMathCalculator:
             self.error_message = str(e)
             return None
     
+    def vector_norms(self, vectors):
+        """Magnitudes of every row of an N×D array of vectors."""
+        try:
+            norms = _vector_norms(_vector_rows(vectors))
+            return norms if np is not None else array('d', norms)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def pairwise_similarity(self, queries, corpus, metric: str = 'cosine', 
+                            mode: str = 'deg', block_size: int = 256):
+        """
+        N×M matrix of dot products, cosines or angles between every query
+        and every corpus vector. Norms are computed once and the work is done
+        in block_size × block_size tiles.
+        """
+        try:
+            q_rows, c_rows = _vector_rows(queries), _vector_rows(corpus)
+            q_norms, c_norms = _vector_norms(q_rows), _vector_norms(c_rows)
+            _check_similarity_inputs(q_rows, c_rows, q_norms, c_norms, metric)
+            
+            if np is not None:
+                result = np.empty((len(q_rows), len(c_rows)))
+            else:
+                result = [[] for _ in range(len(q_rows))]
+            for i0 in range(0, len(q_rows), block_size):
+                i1 = min(i0 + block_size, len(q_rows))
+                for j0 in range(0, len(c_rows), block_size):
+                    j1 = min(j0 + block_size, len(c_rows))
+                    block = _similarity_block(q_rows[i0:i1], q_norms[i0:i1], 
+                                              c_rows[j0:j1], c_norms[j0:j1], metric, mode)
+                    if np is not None:
+                        result[i0:i1, j0:j1] = block
+                    else:
+                        for i, scores in enumerate(block, i0):
+                            result[i].extend(scores)
+            return result
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def top_k_similar(self, queries, corpus, k: int = 10, metric: str = 'cosine', 
+                      mode: str = 'deg', block_size: int = 1024) -> List[List[Tuple[int, float]]]:
+        """
+        For each query, the k nearest corpus vectors as (index, score) pairs,
+        best first (highest dot/cosine, smallest angle). The corpus is
+        streamed in blocks, so the full N×M score matrix is never built.
+        """
+        try:
+            if k < 1:
+                raise ValueError("k must be at least 1")
+            q_rows, c_rows = _vector_rows(queries), _vector_rows(corpus)
+            q_norms, c_norms = _vector_norms(q_rows), _vector_norms(c_rows)
+            _check_similarity_inputs(q_rows, c_rows, q_norms, c_norms, metric)
+            # Heaps hold the current best k per query; angles rank by negated score
+            sign = -1.0 if metric == 'angle' else 1.0
+            heaps = [[] for _ in range(len(q_rows))]
+            
+            for j0 in range(0, len(c_rows), block_size):
+                j1 = min(j0 + block_size, len(c_rows))
+                block = _similarity_block(q_rows, q_norms, c_rows[j0:j1], 
+                                          c_norms[j0:j1], metric, mode)
+                for heap, scores in zip(heaps, block):
+                    if np is not None and len(scores) > k:
+                        keep = np.argpartition(-sign * scores, k - 1)[:k]
+                        candidates = ((float(scores[j]), j0 + int(j)) for j in keep)
+                    else:
+                        candidates = ((float(x), j) for j, x in enumerate(scores, j0))
+                    for score, index in candidates:
+                        item = (sign * score, -index)
+                        if len(heap) < k:
+                            heapq.heappush(heap, item)
+                        elif item > heap[0]:
+                            heapq.heapreplace(heap, item)
+            
+            return [[(-neg_index, sign * key) for key, neg_index in sorted(heap, reverse=True)]
+                    for heap in heaps]
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
     # ==================== SPECIAL FUNCTIONS ====================
     
     def gamma_function(self, x: float) -> Union[float, None]:
@@ -736,9 +3954,17 @@ class AdvancedMathCalculator:
             return None
     
     def beta_function(self, x: float, y: float) -> Union[float, None]:
-        """Calculate beta function B(x,y)."""
+        """Calculate beta function B(x,y); large arguments go through lgamma instead of overflowing."""
+        try:
+            return _beta(x, y)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def log_beta_function(self, x: float, y: float) -> Union[float, None]:
+        """Calculate log|B(x,y)| = lgamma(x) + lgamma(y) - lgamma(x+y)."""
         try:
-            return math.gamma(x) * math.gamma(y) / math.gamma(x + y)
+            return _log_abs_beta(x, y)
         except Exception as e:
             self.error_message = str(e)
             return None
@@ -750,3 +3976,175 @@ class AdvancedMathCalculator:
         except Exception as e:
             self.error_message = str(e)
             return None
+    
+    def special_function_batch(self, function: str, x, y=None, 
+                               approximate: bool = False, out=None):
+        """
+        Apply gamma, lgamma, beta, log_beta, erf or erfc to a whole array.
+        beta and log_beta take a second array y (scalars broadcast). Poles
+        give NaN (lgamma: inf) and overflow gives inf instead of an error.
+        approximate=True evaluates erf/erfc from an interpolated table with
+        absolute error ≤ 1e-9 when NumPy is available; without NumPy the
+        exact C functions are already faster than any per-element table.
+        Returns an ndarray or array('d'), written into out if supplied.
+        """
+        try:
+            if function not in _SPECIAL_FUNCTIONS:
+                raise ValueError(f"Unknown special function: {function}")
+            arity, kernel, domain_value = _SPECIAL_FUNCTIONS[function]
+            if (arity == 2) != (y is not None):
+                raise ValueError(f"{function} takes {arity} argument array(s)")
+            if approximate and function not in ('erf', 'erfc'):
+                raise ValueError("Approximate mode is available for erf and erfc only")
+            kernel = _total_kernel(kernel, domain_value)
+            
+            if np is not None:
+                xs = np.asarray(x, dtype=float)
+                if approximate:
+                    values = _erf_approximate(xs)
+                    return _store(out, values if function == 'erf' else 1.0 - values)
+                if arity == 1:
+                    values = np.fromiter(map(kernel, xs.ravel().tolist()), float, xs.size)
+                    return _store(out, values.reshape(xs.shape))
+                xs, ys = np.broadcast_arrays(xs, np.asarray(y, dtype=float))
+                values = np.fromiter(map(kernel, xs.ravel().tolist(), ys.ravel().tolist()),
+                                     float, xs.size)
+                return _store(out, values.reshape(xs.shape))
+            
+            xs = [x] if isinstance(x, (int, float)) else _numeric_view(x)
+            if arity == 1:
+                return _store(out, array('d', map(kernel, xs)))
+            ys = [y] if isinstance(y, (int, float)) else _numeric_view(y)
+            if len(xs) == 1:
+                xs = [xs[0]] * len(ys)
+            if len(ys) == 1:
+                ys = [ys[0]] * len(xs)
+            if len(xs) != len(ys):
+                raise ValueError("x and y must have the same length")
+            return _store(out, array('d', map(kernel, xs, ys)))
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    # ==================== EXPRESSION EVALUATION ====================
+    
+    def compile_expression(self, expression: str) -> Union[CompiledExpression, None]:
+        """Parse an expression once (cached by source text) for repeated use."""
+        try:
+            return _compile_expression(expression)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def evaluate_expression(self, expression: str, 
+                            variables: Dict = None) -> Union[float, None]:
+        """
+        Evaluate an expression string such as "a*x^2 + sin(t)".
+        Variables come from self.variables, overridden by the per-call mapping.
+        """
+        try:
+            compiled = _compile_expression(expression)
+            _check_variable_names(variables)
+            # Stored variables named like a function can never be referenced, so skip them
+            env = {k: v for k, v in self.variables.items() if k not in _EXPRESSION_FUNCTIONS}
+            if variables:
+                env.update(variables)
+            return compiled.evaluate(env)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+    
+    def evaluate_expression_batch(self, expression: str, columns: Dict):
+        """Evaluate an expression over arrays of variable values."""
+        try:
+            compiled = _compile_expression(expression)
+            _check_variable_names(columns)
+            env = {k: v for k, v in self.variables.items() if k not in _EXPRESSION_FUNCTIONS}
+            env.update(columns)
+            return compiled.evaluate_batch(env)
+        except Exception as e:
+            self.error_message = str(e)
+            return None
+
+
+# ==================== STATELESS CALLING CONVENTION ====================
+
+class CalculationError(ValueError):
+    """A calculator operation failed; operation names the method that failed."""
+    
+    def __init__(self, operation: str, message: str):
+        super().__init__(message)
+        self.operation = operation
+        self.message = message
+
+
+class Result(NamedTuple):
+    """Outcome of one stateless call: a value, or an error message."""
+    value: Any = None
+    error: Union[str, None] = None
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+    
+    def unwrap(self, operation: str = '') -> Any:
+        """Return the value or raise CalculationError."""
+        if self.error is not None:
+            raise CalculationError(operation, self.error)
+        return self.value
+
+
+class StatelessCalculator:
+    """
+    Thread-safe facade over AdvancedMathCalculator.
+    
+    Every call runs against a private scratch engine, so one instance can be
+    shared across a ThreadPoolExecutor (including free-threaded CPython)
+    without racing on error_message, last_result or variables. Methods of
+    the same names return the value or raise CalculationError; call()
+    returns a Result instead of raising. Variables are fixed at construction.
+    """
+    
+    def __init__(self, variables: Dict = None):
+        self.variables = MappingProxyType(dict(variables or {}))
+    
+    def _scratch(self) -> AdvancedMathCalculator:
+        engine = AdvancedMathCalculator.__new__(AdvancedMathCalculator)
+        engine.last_result = 0
+        engine.error_message = ""
+        engine.variables = self.variables
+        return engine
+    
+    def call(self, operation: str, *args, **kwargs) -> Result:
+        """Run one operation and return a Result; never raises for calculation errors."""
+        method = _STATELESS_OPERATIONS.get(operation)
+        if method is None:
+            return Result(error=f"Unknown operation: {operation}")
+        engine = self._scratch()
+        try:
+            value = method(engine, *args, **kwargs)
+        except Exception as e:
+            return Result(error=str(e) or type(e).__name__)
+        if value is None and engine.error_message:
+            return Result(error=engine.error_message)
+        return Result(value)
+
+
+_STATELESS_OPERATIONS = {
+    name: member for name, member in vars(AdvancedMathCalculator).items()
+    if not name.startswith('_') and callable(member)
+}
+
+
+def _raising_operation(name: str, method):
+    def operation(self, *args, **kwargs):
+        return self.call(name, *args, **kwargs).unwrap(name)
+    operation.__name__ = name
+    operation.__doc__ = method.__doc__
+    return operation
+
+
+for _name, _method in _STATELESS_OPERATIONS.items():
+    setattr(StatelessCalculator, _name, _raising_operation(_name, _method))
+del _name, _method
+
@@ -0,0 +1,203 @@
+"""
+Opt-in per-method instrumentation for AdvancedMathCalculator.
+
+    from calculator_metrics import instrument
+    calc = AdvancedMathCalculator()
+    metrics = instrument(calc)          # wrap every public method of calc
+    ...
+    metrics.snapshot()                  # dict of counters and histograms
+    metrics.write_prometheus('calc.prom')
+    metrics.disable()                   # restore the plain methods
+
+Instrumentation replaces bound methods on a single instance only, so
+calculators that were never instrumented run the original code untouched.
+Calls an instrumented method makes to others (solve_cubic -> solve_quadratic)
+are not counted separately; only the outermost call is recorded.
+"""
+
+import bisect
+import os
+import threading
+import time
+from typing import Dict, List
+
+from calculator_engine import AdvancedMathCalculator
+
+# Latency bucket upper bounds in seconds (Prometheus histogram convention)
+LATENCY_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0)
+
+# Error kind for calls that report failure by returning None (the engine's
+# convention); exceptions that escape are counted under their type name.
+# Messages are never used as keys: they embed values and would grow without bound.
+FAILED = 'failed'
+
+
+class MethodStats:
+    """Counters for one method."""
+
+    def __init__(self):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.input_items = 0
+        self.max_input_items = 0
+        self.errors: Dict[str, int] = {}  # error kind -> count
+
+    def to_dict(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'total_seconds': self.total_seconds,
+            'mean_seconds': self.total_seconds / self.calls if self.calls else 0.0,
+            'latency_buckets': dict(zip([*map(str, LATENCY_BUCKETS), '+Inf'],
+                                        self.bucket_counts)),
+            'input_items': self.input_items,
+            'max_input_items': self.max_input_items,
+            'errors': dict(self.errors),
+        }
+
+
+def _input_size(args) -> int:
+    """Length of the first sized, non-string argument (data list, matrix rows, ...)."""
+    for arg in args:
+        if not isinstance(arg, (int, float, str, bytes)) and hasattr(arg, '__len__'):
+            return len(arg)
+    return 0
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Instrumentation:
+    """Collects call counts, latency histograms, input sizes and errors per method."""
+
+    def __init__(self, calculator: AdvancedMathCalculator, methods: List[str] = None):
+        self.calculator = calculator
+        self.stats: Dict[str, MethodStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()  # per-thread nesting depth
+        if methods is None:
+            methods = [name for name in dir(type(calculator))
+                       if not name.startswith('_') and callable(getattr(type(calculator), name))]
+        self.methods = methods
+
+    def enable(self) -> 'Instrumentation':
+        for name in self.methods:
+            self.stats.setdefault(name, MethodStats())
+            # Shadow the class attribute with an instance-level wrapper
+            setattr(self.calculator, name, self._wrap(name, getattr(type(self.calculator), name)))
+        return self
+
+    def disable(self):
+        for name in self.methods:
+            self.calculator.__dict__.pop(name, None)
+
+    def _wrap(self, name: str, function):
+        calculator = self.calculator
+        stats = self.stats[name]
+        lock = self._lock
+        local = self._local
+        perf_counter = time.perf_counter
+        bisect_left = bisect.bisect_left
+
+        def wrapper(*args, **kwargs):
+            depth = getattr(local, 'depth', 0)
+            if depth:
+                # Nested call: its time and errors belong to the outer call
+                return function(calculator, *args, **kwargs)
+            local.depth = 1
+            error = None
+            start = perf_counter()
+            try:
+                result = function(calculator, *args, **kwargs)
+                if result is None:
+                    error = FAILED
+                return result
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                elapsed = perf_counter() - start
+                local.depth = 0
+                size = _input_size(args) if args else 0
+                with lock:
+                    stats.calls += 1
+                    stats.total_seconds += elapsed
+                    stats.bucket_counts[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+                    if size:
+                        stats.input_items += size
+                        if size > stats.max_input_items:
+                            stats.max_input_items = size
+                    if error is not None:
+                        stats.errors[error] = stats.errors.get(error, 0) + 1
+
+        wrapper.__name__ = name
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+
+    def reset(self):
+        with self._lock:
+            for name in self.stats:
+                self.stats[name] = MethodStats()
+        # Wrappers hold their MethodStats directly, so rebind them
+        if any(name in self.calculator.__dict__ for name in self.methods):
+            self.enable()
+
+    def snapshot(self, include_idle: bool = False) -> Dict[str, Dict]:
+        """Copy of the current counters, keyed by method name."""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self.stats.items())
+                    if include_idle or stats.calls}
+
+    def prometheus_text(self) -> str:
+        """Render the counters in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            '# HELP calculator_calls_total Calls per calculator method.',
+            '# TYPE calculator_calls_total counter',
+        ]
+        for name, stats in snapshot.items():
+            lines.append(f'calculator_calls_total{{method="{name}"}} {stats["calls"]}')
+
+        lines += [
+            '# HELP calculator_latency_seconds Method latency.',
+            '# TYPE calculator_latency_seconds histogram',
+        ]
+        for name, stats in snapshot.items():
+            cumulative = 0
+            for bound, count in stats['latency_buckets'].items():
+                cumulative += count
+                lines.append(f'calculator_latency_seconds_bucket{{method="{name}",le="{bound}"}} '
+                             f'{cumulative}')
+            lines.append(f'calculator_latency_seconds_sum{{method="{name}"}} '
+                         f'{stats["total_seconds"]!r}')
+            lines.append(f'calculator_latency_seconds_count{{method="{name}"}} {stats["calls"]}')
+
+        lines += [
+            '# HELP calculator_input_items_total Input elements processed per method.',
+            '# TYPE calculator_input_items_total counter',
+        ]
+        for name, stats in snapshot.items():
+            lines.append(f'calculator_input_items_total{{method="{name}"}} {stats["input_items"]}')
+
+        lines += [
+            '# HELP calculator_errors_total Failed calls per method and error kind.',
+            '# TYPE calculator_errors_total counter',
+        ]
+        for name, stats in snapshot.items():
+            for kind, count in sorted(stats['errors'].items()):
+                lines.append(f'calculator_errors_total{{method="{name}",'
+                             f'kind="{_escape_label(kind)}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str):
+        """Atomically write prometheus_text() to path (e.g. for node_exporter's textfile collector)."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(temp_path, path)
+
+
+def instrument(calculator: AdvancedMathCalculator, methods: List[str] = None) -> Instrumentation:
+    """Start recording metrics for calculator's public methods (or just methods)."""
+    return Instrumentation(calculator, methods).enable()
@@ -0,0 +1,431 @@
+"""
+Loopback HTTP/JSON service for AdvancedMathCalculator (standard library only).
+
+    python calculator_server.py --port 8080 --workers 4
+
+    curl -s localhost:8080/calculate -d '{"op": "solve_quadratic", "args": [1, -3, 2]}'
+    {"result": {"type": "real_distinct", ...}}
+    curl -s localhost:8080/health
+    curl -s localhost:8080/metrics          # Prometheus text format
+
+POST /calculate takes the same request objects as calculator_batch.py and
+answers with the same response objects. Calculations run in a process pool.
+Identical requests that arrive while one is already computing share its
+result. Results of deterministic operations are kept in a TTL/LRU cache.
+Overload is refused with 503 instead of queueing without bound.
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from calculator_batch import process_chunk
+from calculator_engine import AdvancedMathCalculator
+from calculator_metrics import LATENCY_BUCKETS, _escape_label
+
+# Operations whose result can change between identical calls (random sketches)
+UNCACHEABLE_OPERATIONS = frozenset({'streaming_quartiles'})
+# Operations not offered over HTTP: they read files on the server
+BLOCKED_OPERATIONS = frozenset({'file_statistics'})
+
+_STATUS_TEXT = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    408: 'Request Timeout', 413: 'Payload Too Large', 431: 'Request Header Fields Too Large',
+    503: 'Service Unavailable', 504: 'Gateway Timeout',
+}
+_MAX_HEADER_LINES = 100
+
+
+class ResponseCache:
+    """LRU cache whose entries also expire ttl seconds after they were stored."""
+
+    def __init__(self, capacity: int = 4096, ttl: float = 300.0):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Dict):
+        if self.capacity <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ServiceMetrics:
+    """Counters for the service; rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.http_responses: Dict[Tuple[str, int], int] = {}
+        # outcome: computed, cache_hit, coalesced, rejected, timeout
+        self.calculations: Dict[Tuple[str, str], int] = {}
+        self.latency_buckets: Dict[str, List[int]] = {}
+        self.latency_sum: Dict[str, float] = {}
+
+    def count_response(self, path: str, status: int):
+        key = (path, status)
+        self.http_responses[key] = self.http_responses.get(key, 0) + 1
+
+    def count_calculation(self, op: str, outcome: str):
+        key = (op, outcome)
+        self.calculations[key] = self.calculations.get(key, 0) + 1
+
+    def observe_latency(self, op: str, seconds: float):
+        buckets = self.latency_buckets.setdefault(op, [0] * (len(LATENCY_BUCKETS) + 1))
+        buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.latency_sum[op] = self.latency_sum.get(op, 0.0) + seconds
+
+    def prometheus_text(self, gauges: Dict[str, float]) -> str:
+        lines = [
+            '# HELP calculator_http_responses_total HTTP responses by path and status.',
+            '# TYPE calculator_http_responses_total counter',
+        ]
+        for (path, status), count in sorted(self.http_responses.items()):
+            lines.append(f'calculator_http_responses_total{{path="{_escape_label(path)}",'
+                         f'status="{status}"}} {count}')
+
+        lines += [
+            '# HELP calculator_requests_total Calculation requests by operation and outcome.',
+            '# TYPE calculator_requests_total counter',
+        ]
+        for (op, outcome), count in sorted(self.calculations.items()):
+            lines.append(f'calculator_requests_total{{method="{_escape_label(op)}",'
+                         f'outcome="{outcome}"}} {count}')
+
+        lines += [
+            '# HELP calculator_compute_seconds Worker time per computed request.',
+            '# TYPE calculator_compute_seconds histogram',
+        ]
+        for op, buckets in sorted(self.latency_buckets.items()):
+            label = _escape_label(op)
+            cumulative = 0
+            for bound, count in zip([*map(str, LATENCY_BUCKETS), '+Inf'], buckets):
+                cumulative += count
+                lines.append(f'calculator_compute_seconds_bucket{{method="{label}",le="{bound}"}} '
+                             f'{cumulative}')
+            lines.append(f'calculator_compute_seconds_sum{{method="{label}"}} '
+                         f'{self.latency_sum[op]!r}')
+            lines.append(f'calculator_compute_seconds_count{{method="{label}"}} {cumulative}')
+
+        for name, value in gauges.items():
+            lines += [f'# TYPE calculator_{name} gauge', f'calculator_{name} {value}']
+        return '\n'.join(lines) + '\n'
+
+
+def _compute(line: str) -> Tuple[Dict, float]:
+    """Worker entry point: run one canonical request line, return (response, seconds)."""
+    start = time.perf_counter()
+    try:
+        response = json.loads(process_chunk([line])[0])
+    except Exception as e:  # e.g. a result too large to encode as JSON
+        response = {'error': str(e)}
+    return response, time.perf_counter() - start
+
+
+class CalculatorService:
+    """
+    asyncio HTTP/1.1 server (keep-alive, Content-Length bodies) that hands
+    calculations to a worker pool.
+
+    Limits: max_pending distinct calculations in the pool (further requests
+    get 503 with Retry-After), max_connections open sockets, max_body bytes
+    per request, request_timeout seconds to receive a request and
+    compute_timeout seconds to wait for a result (504).
+    """
+
+    def __init__(self, workers: int = None, cache_size: int = 4096, cache_ttl: float = 300.0,
+                 max_pending: int = None, max_connections: int = 256,
+                 max_body: int = 1 << 20, request_timeout: float = 10.0,
+                 compute_timeout: float = 30.0, executor=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 4 * self.workers
+        self.max_connections = max_connections
+        self.max_body = max_body
+        self.request_timeout = request_timeout
+        self.compute_timeout = compute_timeout
+        self.cache = ResponseCache(cache_size, cache_ttl)
+        self.metrics = ServiceMetrics()
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._connections = 0
+        self._server = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        # Start every worker (and its engine) before accepting connections:
+        # forking later, from inside a connection handler, can hang the child
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, process_chunk, [])
+                               for _ in range(self.workers)))
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- HTTP ---
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if self._connections >= self.max_connections:
+            await self._respond(writer, '-', 503, {'error': 'Too many connections'},
+                                keep_alive=False, retry_after=True)
+            writer.close()
+            return
+        self._connections += 1
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader),
+                                                     self.request_timeout)
+                except asyncio.TimeoutError:
+                    await self._respond(writer, '-', 408, {'error': 'Request timeout'},
+                                        keep_alive=False)
+                    break
+                except _HttpError as e:
+                    await self._respond(writer, '-', e.status, {'error': e.message},
+                                        keep_alive=False)
+                    break
+                if request is None:  # client closed the connection
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                status, payload, content_type = await self._route(method, path, body)
+                await self._respond(writer, path, status, payload, keep_alive,
+                                    content_type=content_type, retry_after=(status == 503))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections -= 1
+            writer.close()
+
+    @staticmethod
+    async def _read_line(reader: asyncio.StreamReader, status: int, message: str) -> bytes:
+        # readline raises ValueError (wrapping LimitOverrunError) past the stream limit
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise _HttpError(status, message)
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        request_line = await self._read_line(reader, 400, 'Request line too long')
+        if not request_line:
+            return None
+        try:
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise _HttpError(400, 'Malformed request line')
+
+        headers = {}
+        for _ in range(_MAX_HEADER_LINES):
+            line = await self._read_line(reader, 431, 'Header line too long')
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise _HttpError(431, 'Too many header lines')
+
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            raise _HttpError(400, 'Invalid Content-Length')
+        if length < 0 or length > self.max_body:
+            raise _HttpError(413, f'Body exceeds {self.max_body} bytes')
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target.split('?', 1)[0], headers, body
+
+    async def _respond(self, writer: asyncio.StreamWriter, path: str, status: int, payload,
+                       keep_alive: bool, content_type: str = 'application/json',
+                       retry_after: bool = False):
+        self.metrics.count_response(path, status)
+        body = (payload if isinstance(payload, str) else json.dumps(payload)).encode('utf-8')
+        head = [f'HTTP/1.1 {status} {_STATUS_TEXT.get(status, "")}',
+                f'Content-Type: {content_type}',
+                f'Content-Length: {len(body)}',
+                f'Connection: {"keep-alive" if keep_alive else "close"}']
+        if retry_after:
+            head.append('Retry-After: 1')
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def _route(self, method: str, path: str, body: bytes):
+        """Return (status, payload, content type) for one request."""
+        if path == '/calculate':
+            if method != 'POST':
+                return 405, {'error': 'Use POST'}, 'application/json'
+            status, payload = await self.calculate(body)
+            return status, payload, 'application/json'
+        if path == '/health':
+            return 200, self.health(), 'application/json'
+        if path == '/metrics':
+            return 200, self.metrics.prometheus_text(self._gauges()), 'text/plain; version=0.0.4'
+        return 404, {'error': f'Unknown path: {path}'}, 'application/json'
+
+    # --- calculations ---
+
+    async def calculate(self, body: bytes) -> Tuple[int, Dict]:
+        """Run one request body through cache, coalescing and the worker pool."""
+        try:
+            request = json.loads(body)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+        except ValueError as e:
+            return 400, {'error': f"Invalid request: {e}"}
+        op = request.get('op')
+        if (not isinstance(op, str) or op.startswith('_') or op in BLOCKED_OPERATIONS
+                or not callable(getattr(AdvancedMathCalculator, op, None))):
+            return 400, {'error': f"Unknown operation: {op}"}
+
+        # Identical calculations share one canonical key regardless of id or key order
+        try:
+            line = json.dumps({'op': op, 'args': request.get('args', []),
+                               'kwargs': request.get('kwargs', {})}, sort_keys=True)
+        except (TypeError, ValueError) as e:
+            return 400, {'error': f"Invalid request: {e}"}
+        prefix = {'id': request['id']} if 'id' in request else {}
+        cacheable = op not in UNCACHEABLE_OPERATIONS
+
+        cached = self.cache.get(line) if cacheable else None
+        if cached is not None:
+            self.metrics.count_calculation(op, 'cache_hit')
+            return 200, {**prefix, **cached}
+
+        future = self._in_flight.get(line)
+        if future is not None:
+            self.metrics.count_calculation(op, 'coalesced')
+        else:
+            if len(self._in_flight) >= self.max_pending:
+                self.metrics.count_calculation(op, 'rejected')
+                return 503, {**prefix, 'error': 'Server busy, retry later'}
+            try:
+                future = asyncio.get_running_loop().run_in_executor(self._executor, _compute, line)
+            except RuntimeError as e:  # BrokenProcessPool or pool shut down
+                return 503, {**prefix, 'error': f"Worker pool unavailable: {e}"}
+            self._in_flight[line] = future
+            future.add_done_callback(lambda f, key=line, op=op, cacheable=cacheable:
+                                     self._finished(key, op, cacheable, f))
+            self.metrics.count_calculation(op, 'computed')
+
+        try:
+            # shield: one client timing out must not cancel the shared computation
+            response, _ = await asyncio.wait_for(asyncio.shield(future), self.compute_timeout)
+        except asyncio.TimeoutError:
+            self.metrics.count_calculation(op, 'timeout')
+            return 504, {**prefix, 'error': 'Calculation timed out'}
+        except Exception as e:  # worker crashed or pool shut down
+            return 503, {**prefix, 'error': f"Worker failure: {e}"}
+        return 200, {**prefix, **response}
+
+    def _finished(self, key: str, op: str, cacheable: bool, future: asyncio.Future):
+        self._in_flight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        response, seconds = future.result()
+        self.metrics.observe_latency(op, seconds)
+        if cacheable:
+            self.cache.put(key, response)
+
+    def _gauges(self) -> Dict[str, float]:
+        return {
+            'in_flight_calculations': len(self._in_flight),
+            'open_connections': self._connections,
+            'cache_entries': len(self.cache),
+            'uptime_seconds': round(time.time() - self.metrics.started, 3),
+        }
+
+    def health(self) -> Dict:
+        return {
+            'status': 'ok' if len(self._in_flight) < self.max_pending else 'saturated',
+            'workers': self.workers,
+            'in_flight': len(self._in_flight),
+            'max_pending': self.max_pending,
+            'connections': self._connections,
+            'cache_entries': len(self.cache),
+            'uptime_seconds': round(time.time() - self.metrics.started, 3),
+        }
+
+
+class _HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def serve(host: str, port: int, **options):
+    service = CalculatorService(**options)
+    server = await service.start(host, port)
+    print(f"Serving on http://{host}:{service.port}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve calculator requests over HTTP/JSON.")
+    parser.add_argument('--host', default='127.0.0.1', help="bind address (default: loopback)")
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--cache-size', type=int, default=4096,
+                        help="cached results (0 disables the cache)")
+    parser.add_argument('--cache-ttl', type=float, default=300.0, help="seconds a result is cached")
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help="distinct calculations queued at once (default: 4 per worker)")
+    parser.add_argument('--max-connections', type=int, default=256)
+    parser.add_argument('--max-body', type=int, default=1 << 20, help="request body limit in bytes")
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help="seconds to wait for a calculation before answering 504")
+    args = parser.parse_args(argv)
+
+    if (args.workers is not None and args.workers < 1) or args.max_connections < 1:
+        parser.error("--workers and --max-connections must be positive")
+
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers,
+                          cache_size=args.cache_size, cache_ttl=args.cache_ttl,
+                          max_pending=args.max_pending, max_connections=args.max_connections,
+                          max_body=args.max_body, compute_timeout=args.timeout))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+import json
+import math
+import unittest
+from fractions import Fraction
+
+from calculator_engine import AdvancedMathCalculator, solution_tuple
+
+
+class SolverResultTests(unittest.TestCase):
+    """Solver results stay plain dicts: JSON-encodable and comparable to literals."""
+
+    def setUp(self):
+        self.calc = AdvancedMathCalculator()
+
+    def test_results_are_json_serializable(self):
+        results = [
+            self.calc.solve_linear(2, 4),
+            self.calc.solve_linear(0, 0),
+            self.calc.solve_quadratic(1, -3, 2),
+            self.calc.solve_quadratic(1, 2, 1),
+            self.calc.solve_2x2_system(1, 1, 3, 1, -1, 1),
+            self.calc.solve_3x3_system([[2, 1, -1], [-3, -1, 2], [-2, 1, 2]], [8, -11, -3]),
+            self.calc.solve_linear_system([[4, 1], [1, 3]], [1, 2]),
+        ]
+        for result in results:
+            self.assertIsInstance(result, dict)
+            self.assertEqual(json.loads(json.dumps(result)), result)
+
+    def test_historical_shapes(self):
+        self.assertEqual(self.calc.solve_quadratic(1, -3, 2),
+                         {'type': 'real_distinct', 'solutions': [2.0, 1.0], 'discriminant': 1})
+        self.assertEqual(self.calc.solve_2x2_system(1, 1, 3, 1, -1, 1),
+                         {'type': 'unique', 'x': 2.0, 'y': 1.0})
+        self.assertEqual(self.calc.solve_linear(0, 1),
+                         {'type': 'no_solution', 'message': 'No solution exists'})
+
+    def test_solution_tuple(self):
+        self.assertEqual(solution_tuple(self.calc.solve_linear(2, 4)), (-2.0,))
+        self.assertEqual(solution_tuple(self.calc.solve_quadratic(1, -3, 2)), (2.0, 1.0))
+        self.assertEqual(solution_tuple(self.calc.solve_2x2_system(1, 1, 3, 1, -1, 1)), (2.0, 1.0))
+        x, y, z = solution_tuple(self.calc.solve_3x3_system([[1, 0, 0], [0, 2, 0], [0, 0, 4]],
+                                                            [1, 2, 4]))
+        self.assertEqual((x, y, z), (1.0, 1.0, 1.0))
+        self.assertEqual(solution_tuple(self.calc.solve_linear(0, 0)), ())
+
+
+class RootFindingTests(unittest.TestCase):
+    """Bracketing root finders converge on multiple roots, not just simple ones."""
+
+    MULTIPLE_ROOTS = [
+        (lambda x: (x - 1) ** 3, 0.0, 5.0, 1.0),
+        (lambda x: x ** 9, -1.0, 2.0, 0.0),
+        (lambda x: (x - 1) ** 5, 0.0, 5.0, 1.0),
+    ]
+
+    def setUp(self):
+        self.calc = AdvancedMathCalculator()
+
+    def test_find_root_converges_on_multiple_roots(self):
+        for method in ('brent', 'illinois'):
+            for func, a, b, root in self.MULTIPLE_ROOTS:
+                result = self.calc.find_root(func, a, b, method=method)
+                self.assertTrue(result['converged'], (method, a, b, result))
+                self.assertLessEqual(result['bracket_width'], 1e-12)
+                self.assertAlmostEqual(result['root'], root, delta=1e-12)
+
+    def test_find_root_batch_converges_on_multiple_roots(self):
+        funcs = [func for func, _, _, _ in self.MULTIPLE_ROOTS]
+
+        def batch(xs, index):
+            return [funcs[int(i)](x) for x, i in zip(xs, index)]
+
+        result = self.calc.find_root_batch(batch, [a for _, a, _, _ in self.MULTIPLE_ROOTS],
+                                           [b for _, _, b, _ in self.MULTIPLE_ROOTS],
+                                           args=([0, 1, 2],))
+        self.assertTrue(all(result['converged']))
+        for found, (_, _, _, root) in zip(result['root'], self.MULTIPLE_ROOTS):
+            self.assertAlmostEqual(found, root, delta=1e-12)
+
+    def test_smooth_root_keeps_fast_convergence(self):
+        result = self.calc.find_root(lambda x: x ** 3 - 2 * x - 5, 2, 3)
+        self.assertTrue(result['converged'])
+        self.assertLessEqual(result['iterations'], 8)
+
+
+class IterativeSolverTests(unittest.TestCase):
+    """Mismatched vector lengths are reported instead of silently truncated."""
+
+    MATRIX = [[4, 1], [1, 3]]
+
+    def setUp(self):
+        self.calc = AdvancedMathCalculator()
+
+    def test_rejects_mismatched_lengths(self):
+        for solver in (self.calc.conjugate_gradient, self.calc.gmres):
+            self.assertIsNone(solver(self.MATRIX, [1, 2, 3]))
+            self.assertIn('Expected 2 constants', self.calc.error_message)
+            self.assertIsNone(solver(self.MATRIX, [1, 2], initial_guess=[0]))
+            self.assertIn('initial guess of length 2', self.calc.error_message)
+
+    def test_sparse_matmul_operands(self):
+        sparse = self.calc.sparse_matrix(2, 2, [(0, 0, 4), (0, 1, 1), (1, 0, 1), (1, 1, 3)])
+        self.assertEqual(list(sparse @ [1, 2]), [6.0, 7.0])
+        self.assertEqual([list(row) for row in sparse @ [[1, 0], [0, 1]]], [[4.0, 1.0], [1.0, 3.0]])
+
+
+class MatrixMultiplyTests(unittest.TestCase):
+    """Non-float entries keep exact Python arithmetic, with or without NumPy."""
+
+    def setUp(self):
+        self.calc = AdvancedMathCalculator()
+
+    def test_integer_product_stays_exact(self):
+        big = 10 ** 17 + 1
+        result = self.calc.matrix_multiply([[big, 1], [2, 3]], [[1, 0], [0, 1]])
+        self.assertEqual(result, [[big, 1], [2, 3]])
+        self.assertIsInstance(result[0][0], int)
+        self.assertEqual(self.calc.matrix_multiply([[1, 2], [3, 4]], [[1, 2], [3, 4]]),
+                         [[7, 10], [15, 22]])
+
+    def test_complex_and_fraction_products(self):
+        self.assertEqual(self.calc.matrix_multiply([[1j, 2], [0, 1 + 1j]], [[1j, 0], [1, 1 - 1j]]),
+                         [[1, 2 - 2j], [1 + 1j, 2]])
+        half = Fraction(1, 2)
+        self.assertEqual(self.calc.matrix_multiply([[half, 0], [0, half]], [[1, 3], [5, 7]]),
+                         [[half, Fraction(3, 2)], [Fraction(5, 2), Fraction(7, 2)]])
+
+    def test_float_product(self):
+        self.assertEqual(self.calc.matrix_multiply([[1.0, 2.0], [3.0, 4.0]], [[0.5, 0.0], [0.0, 2.0]]),
+                         [[0.5, 4.0], [1.5, 8.0]])
+
+
+class DifferentiationTests(unittest.TestCase):
+    """Steps that straddle a pole are shrunk, or the failure is reported."""
+
+    def setUp(self):
+        self.calc = AdvancedMathCalculator()
+
+    def test_step_shrinks_near_pole(self):
+        result = self.calc.differentiate(math.tan, 1.5)
+        self.assertAlmostEqual(result['derivative'], 1 / math.cos(1.5) ** 2, delta=1e-9)
+        gradient = self.calc.gradient(lambda p: p[0] ** 2 + math.tan(p[1]), [1.0, 1.5])
+        self.assertAlmostEqual(gradient['gradient'][1], 1 / math.cos(1.5) ** 2, delta=1e-9)
+
+    def test_reports_unsettled_estimate(self):
+        self.assertIsNone(self.calc.differentiate(lambda x: 1 / x, 0.0))
+        self.assertIn('did not converge', self.calc.error_message)
+
+
+class CombinationModPrimeTests(unittest.TestCase):
+    """Lucas' theorem only holds for a prime modulus."""
+
+    def setUp(self):
+        self.calc = AdvancedMathCalculator()
+
+    def test_matches_exact_combination(self):
+        for p in (2, 3, 7, 101):
+            self.assertEqual(self.calc.comb_mod_p(50, 17, p), math.comb(50, 17) % p)
+
+    def test_rejects_composite_modulus(self):
+        for p in (1, 4, 6, 561):
+            self.assertIsNone(self.calc.comb_mod_p(10, 3, p))
+            self.assertIn('prime', self.calc.error_message)
+
+
+if __name__ == '__main__':
+    unittest.main()